@@ -61,13 +61,16 @@ class DistributionalComponent:
             self.output += InterceptTerm(self.component.intercept_term).build(bmb_model)
 
     def build_offsets(self):
-        """Add intercept term to the PyMC model
+        """Add offset terms to the PyMC model
 
         We have linear predictors of the form 'X @ b + Z @ u'. This is technically part of
         'X @ b' but it is added separately for convenience reasons.
+        Offsets are constants, so they're summed with NumPy and added to the linear predictor
+        at once, resulting in a single addition in the graph no matter how many offsets there are.
         """
-        for offset in self.component.offset_terms.values():
-            self.output += offset.data.squeeze()
+        offsets = [offset.data.squeeze() for offset in self.component.offset_terms.values()]
+        if offsets:
+            self.output += np.sum(offsets, axis=0)
 
     def build_common_terms(self, pymc_backend, bmb_model):
         """Add common (fixed) terms to the PyMC model
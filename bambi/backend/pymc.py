@@ -329,22 +329,24 @@ class PyMCModel:
             offset_vars = [var for var in idata.posterior.data_vars if var.endswith("_offset")]
             idata.posterior = idata.posterior.drop_vars(offset_vars)
 
-        dims_original = list(self.model.coords)
-
-        # Don't select dims that are in the model but unused in the posterior
-        dims_original = [dim for dim in dims_original if dim in idata.posterior.dims]
-
+        # Split the dims in a single pass, keeping their original order.
+        # Dims that are in the model but unused in the posterior are not selected.
         # This does not add any new coordinate, it just changes the order so the ones
         # ending in "__factor_dim" are placed after the others.
-        dims_group = [dim for dim in dims_original if dim.endswith("__factor_dim")]
-
-        # Keep the original order in dims_original
-        dims_original_set = set(dims_original) - set(dims_group)
-        dims_original = [dim for dim in dims_original if dim in dims_original_set]
+        dims_original = []
+        dims_group = []
+        for dim in self.model.coords:
+            if dim not in idata.posterior.dims:
+                continue
+            if dim.endswith("__factor_dim"):
+                dims_group.append(dim)
+            else:
+                dims_original.append(dim)
         dims_new = ["chain", "draw"] + dims_original + dims_group
 
         # Drop unused dimensions before transposing
-        dims_to_drop = [dim for dim in idata.posterior.dims if dim not in dims_new]
+        dims_new_set = set(dims_new)
+        dims_to_drop = [dim for dim in idata.posterior.dims if dim not in dims_new_set]
         idata.posterior = idata.posterior.drop_dims(dims_to_drop).transpose(*dims_new)
 
         # Compute the actual intercept in all distributional components that have an intercept
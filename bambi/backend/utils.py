@@ -1,6 +1,6 @@
 import inspect
 
-from functools import partial
+from functools import lru_cache, partial
 
 import pytensor.tensor as pt
 import pymc as pm
@@ -40,12 +40,21 @@ MAPPING = {"Cumulative": pm.Categorical, "StoppingRatio": pm.Categorical, "Horse
 def get_distribution(dist):
     """Return a PyMC distribution."""
     if isinstance(dist, str):
-        if dist in MAPPING:
-            dist = MAPPING[dist]
-        elif hasattr(pm, dist):
-            dist = getattr(pm, dist)
-        else:
-            raise ValueError(f"The Distribution '{dist}' was not found in PyMC")
+        dist = get_distribution_from_name(dist)
+    return dist
+
+
+@lru_cache(maxsize=None)
+def get_distribution_from_name(name):
+    """Return a PyMC distribution given its name
+
+    The lookup is cached because it happens for every term and hyperprior in the model.
+    """
+    if name in MAPPING:
+        return MAPPING[name]
+    dist = getattr(pm, name, None)
+    if dist is None:
+        raise ValueError(f"The Distribution '{name}' was not found in PyMC")
     return dist
 
 
@@ -1,3 +1,4 @@
+from functools import lru_cache
 from typing import Dict, Union
 
 import numpy as np
@@ -105,7 +106,7 @@ class Family:
                 f"Link '{link_name}' cannot be used for '{param_name}' with family "
                 f"'{self.name}'"
             )
-        return Link(link_name)
+        return get_link_from_name(link_name)
 
     def set_default_priors(self, priors):
         """Set default priors for non-parent parameters
@@ -352,3 +353,49 @@ def expand_array(x, ndim):
         return x
     dims_to_expand = tuple(range(ndim - 1, x.ndim - 1, -1))
     return np.expand_dims(x, dims_to_expand)
+
+
+def prepend_zeros(x, dim):
+    """Prepend a slice of zeros to a data array along a given dimension
+
+    It's used to add the linear predictor of the reference level in families where the linear
+    predictor of the reference level is zero (e.g. categorical and multinomial).
+    The zeros are added to the underlying NumPy array, which is cheaper than `xr.DataArray.pad()`.
+    The coordinates of `dim` are dropped because they're no longer valid.
+
+    Parameters
+    ----------
+    x : xr.DataArray
+        The data array
+    dim : str
+        The name of the dimension where zeros are prepended.
+
+    Returns
+    -------
+    xr.DataArray
+        The data array with one more element in `dim`.
+    """
+    pad_width = [(0, 0)] * x.ndim
+    pad_width[x.get_axis_num(dim)] = (1, 0)
+    coords = {name: coord for name, coord in x.coords.items() if dim not in coord.dims}
+    return xr.DataArray(np.pad(x.to_numpy(), pad_width), dims=x.dims, coords=coords)
+
+
+@lru_cache(maxsize=None)
+def get_link_from_name(name):
+    """Get a link function given its name
+
+    Built-in links have no state of their own, so a single instance per name is created and
+    shared by all the families that use it.
+
+    Parameters
+    ----------
+    name : str
+        The name of a built-in link function.
+
+    Returns
+    -------
+    Link
+        The link function.
+    """
+    return Link(name)
@@ -34,7 +34,7 @@ def cloglog(mu):
 
 def invcloglog(eta):
     """Inverse of the cloglog function that ensures result is in (0, 1)."""
-    result = 1 - np.exp(-np.exp(eta))
+    result = -np.expm1(-np.exp(eta))
     return force_within_unit_interval(result)
 
 
@@ -46,7 +46,7 @@ def probit(mu):
 
 def invprobit(eta):
     """Inverse of the probit function that ensures result is in (0, 1)."""
-    result = 0.5 + 0.5 * special.erf(eta / 2**0.5)  # pylint: disable=no-member
+    result = special.ndtr(eta)  # pylint: disable=no-member
     return force_within_unit_interval(result)
 
 
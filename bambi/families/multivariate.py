@@ -1,9 +1,11 @@
 # pylint: disable=unused-argument
+from functools import lru_cache
+
 import numpy as np
 import pytensor.tensor as pt
 import xarray as xr
 
-from bambi.families.family import Family
+from bambi.families.family import Family, prepend_zeros
 from bambi.transformations import transformations_namespace
 from bambi.utils import extract_argument_names, get_aliased_name, response_evaluate_new_data
 
@@ -22,8 +24,7 @@ class Multinomial(MultivariateFamily):
     ) -> xr.DataArray:  # pylint: disable = unused-variable
         response_name = get_aliased_name(model.response_component.term)
         response_levels_dim = response_name + "_reduced_dim"
-        linear_predictor = linear_predictor.pad({response_levels_dim: (1, 0)}, constant_values=0)
-        return linear_predictor
+        return prepend_zeros(linear_predictor, response_levels_dim)
 
     def transform_coords(self, model, mean):
         # The mean has the reference level in the dimension, a new name is needed
@@ -39,15 +40,25 @@ class Multinomial(MultivariateFamily):
         data = kwargs["data"]
         if data is None:
             y = model.response_component.term.data
-            trials = model.response_component.term.data.sum(1).astype(int)
         else:
-            y = response_evaluate_new_data(model, data).astype(int)
-            trials = y.sum(1).astype(int)
+            y = response_evaluate_new_data(model, data)
+
+        # The number of trials is cast to a native integer array once, before sampling
+        trials = y.sum(1).astype(np.int64)
 
         # Prepend 'draw' and 'chain' dimensions
         trials = trials[np.newaxis, np.newaxis, :]
         dont_reshape = ["n"]
-        return super().posterior_predictive(model, posterior, n=trials, dont_reshape=dont_reshape)
+        kwargs, coords = self._make_dist_kwargs_and_coords(
+            model, posterior, n=trials, dont_reshape=dont_reshape
+        )
+
+        # 'Generator.multinomial' broadcasts 'n' against the leading dimensions of 'pvals', so
+        # a single call gets the draws for all the chains, draws, and observations.
+        # This avoids compiling a PyTensor function just to draw from the distribution.
+        rng = np.random.default_rng()
+        output_array = rng.multinomial(kwargs["n"], kwargs["p"])
+        return xr.DataArray(output_array, coords=coords)
 
     def log_likelihood(self, model, posterior, data, **kwargs):
         if data is None:
@@ -73,9 +84,9 @@ class Multinomial(MultivariateFamily):
         return {name: labels[1:]}
 
     def get_levels(self, response):
-        labels = extract_argument_names(response.name, list(transformations_namespace))
+        labels = extract_response_labels(response.name)
         if labels:
-            return labels
+            return list(labels)
         return [str(level) for level in range(response.data.shape[1])]
 
     @staticmethod
@@ -90,8 +101,9 @@ class Multinomial(MultivariateFamily):
         # Add column of zeros to the linear predictor for the reference level (the first one)
         shape = (data.shape[0], 1)
 
-        # The first line makes sure the intercept-only models work
-        eta = np.ones(shape) * eta  # (response_levels, ) -> (n, response_levels)
+        # The first line makes sure the intercept-only models work.
+        # It only broadcasts, so there's no elementwise multiplication in the graph.
+        eta = pt.broadcast_to(eta, (data.shape[0], eta.shape[-1]))  # (1, levels) -> (n, levels)
         eta = pt.concatenate([np.zeros(shape), eta], axis=1)
         return eta
 
@@ -103,15 +115,27 @@ class DirichletMultinomial(MultivariateFamily):
         data = kwargs["data"]
         if data is None:
             y = model.response_component.term.data
-            trials = model.response_component.term.data.sum(1).astype(int)
         else:
-            y = response_evaluate_new_data(model, data).astype(int)
-            trials = y.sum(1).astype(int)
+            y = response_evaluate_new_data(model, data)
+
+        # The number of trials is cast to a native integer array once, before sampling
+        trials = y.sum(1).astype(np.int64)
 
         # Prepend 'draw' and 'chain' dimensions
         trials = trials[np.newaxis, np.newaxis, :]
         dont_reshape = ["n"]
-        return super().posterior_predictive(model, posterior, n=trials, dont_reshape=dont_reshape)
+        kwargs, coords = self._make_dist_kwargs_and_coords(
+            model, posterior, n=trials, dont_reshape=dont_reshape
+        )
+
+        # Compound sampling, as in PyMC, but without compiling a PyTensor function.
+        # The Dirichlet draws are obtained by normalizing independent Gamma draws, which works
+        # with any number of batch dimensions, and then they're used in a single multinomial call.
+        rng = np.random.default_rng()
+        p = rng.standard_gamma(kwargs["a"])
+        p /= p.sum(axis=-1, keepdims=True)
+        output_array = rng.multinomial(kwargs["n"], p)
+        return xr.DataArray(output_array, coords=coords)
 
     def log_likelihood(self, model, posterior, data, **kwargs):
         if data is None:
@@ -136,12 +160,35 @@ class DirichletMultinomial(MultivariateFamily):
         return {name: labels}
 
     def get_levels(self, response):
-        labels = extract_argument_names(response.name, list(transformations_namespace))
+        labels = extract_response_labels(response.name)
         if labels:
-            return labels
+            return list(labels)
         return [str(level) for level in range(response.data.shape[1])]
 
     @staticmethod
     def transform_backend_kwargs(kwargs):
         kwargs["n"] = kwargs["observed"].sum(axis=1).astype(int)
         return kwargs
+
+
+@lru_cache(maxsize=None)
+def extract_response_labels(name):
+    """Extract the labels of a response such as `c(y1, y2, y3)`
+
+    The result is cached because the levels of the response are requested many times, and each
+    time the expression would have to be parsed again.
+
+    Parameters
+    ----------
+    name : str
+        The name of the response term.
+
+    Returns
+    -------
+    tuple or None
+        The labels, or `None` if they can't be extracted from the name.
+    """
+    labels = extract_argument_names(name, list(transformations_namespace))
+    if labels:
+        return tuple(labels)
+    return None
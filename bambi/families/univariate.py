@@ -3,7 +3,7 @@ import pytensor.tensor as pt
 import scipy.special as sp
 import xarray as xr
 
-from bambi.families.family import Family
+from bambi.families.family import Family, prepend_zeros
 from bambi.utils import get_aliased_name, response_evaluate_new_data
 
 
@@ -136,8 +136,7 @@ class Categorical(UnivariateFamily):
     ) -> xr.DataArray:
         response_name = get_aliased_name(model.response_component.term)
         response_levels_dim = response_name + "_reduced_dim"
-        linear_predictor = linear_predictor.pad({response_levels_dim: (1, 0)}, constant_values=0)
-        return linear_predictor
+        return prepend_zeros(linear_predictor, response_levels_dim)
 
     def transform_coords(self, model, mean):
         # The mean has the reference level in the dimension, a new name is needed
@@ -149,8 +148,22 @@ class Categorical(UnivariateFamily):
         mean = mean.assign_coords({response_levels_dim_complete: levels_complete})
         return mean
 
+    def posterior_predictive(self, model, posterior, **kwargs):
+        kwargs, coords = self._make_dist_kwargs_and_coords(model, posterior, **kwargs)
+
+        # Inverse transform sampling for all chains, draws, and observations at once.
+        # A single uniform draw per observation is compared against the cumulative probabilities.
+        # The last level is left out so rounding errors in the cumulative sum can't produce
+        # an index that is out of range.
+        p = kwargs["p"]
+        rng = np.random.default_rng()
+        u = rng.random(p.shape[:-1] + (1,))
+        output_array = (np.cumsum(p[..., :-1], axis=-1) < u).sum(axis=-1)
+        return xr.DataArray(output_array, coords=coords)
+
     def get_data(self, response):
-        return np.nonzero(response.term.data)[1]
+        # Each row is one-hot encoded, so a single 'argmax' pass gives the index of the level
+        return np.argmax(response.term.data, axis=1)
 
     def get_coords(self, response):
         name = get_aliased_name(response) + "_reduced_dim"
@@ -166,8 +179,9 @@ class Categorical(UnivariateFamily):
         # Add column of zeros to the linear predictor for the reference level (the first one)
         shape = (data.shape[0], 1)
 
-        # The first line makes sure the intercept-only models work
-        eta = np.ones(shape) * eta  # (response_levels, ) -> (n, response_levels)
+        # The first line makes sure the intercept-only models work.
+        # It only broadcasts, so there's no elementwise multiplication in the graph.
+        eta = pt.broadcast_to(eta, (data.shape[0], eta.shape[-1]))  # (1, levels) -> (n, levels)
         eta = pt.concatenate([np.zeros(shape), eta], axis=1)
         return eta
 
@@ -1,25 +1,14 @@
-import itertools
-
 from typing import Union
 from statistics import mode
 
 import numpy as np
 import pandas as pd
 
-from pandas.api.types import (
-    is_categorical_dtype,
-    is_float_dtype,
-    is_integer_dtype,
-    is_numeric_dtype,
-    is_object_dtype,
-    is_string_dtype,
-)
-
 from bambi import Model
 from bambi.interpret.utils import (
     ConditionalInfo,
-    enforce_dtypes,
     get_model_covariates,
+    get_variable_kind,
     VariableInfo,
 )
 
@@ -62,39 +51,47 @@ def create_grid(
         data_dict = {**condition.conditional}
     else:
         data_dict = {}
+        numeric_covariates = []
         # values here are the names of the covariates
         for covariate in condition.covariates.values():
             x = observed_data[covariate]
-            num = kwargs.get("num", 50)
-            if is_numeric_dtype(x) or is_float_dtype(x):
-                values = np.linspace(np.min(x), np.max(x), num)
-            elif is_integer_dtype(x):
-                values = np.quantile(x, np.linspace(0, 1, 5))
-            elif is_categorical_dtype(x) or is_string_dtype(x) or is_object_dtype(x):
-                values = np.unique(x)
+            kind = get_variable_kind(x)
+            if kind == "numeric":
+                numeric_covariates.append(covariate)
+            elif kind == "categoric":
+                data_dict[covariate] = np.unique(x)
             else:
-                raise TypeError(
-                    f"Unsupported data type of {x.dtype} for covariate '{covariate.name}'"
-                )
+                raise TypeError(f"Unsupported data type of {x.dtype} for covariate '{covariate}'")
 
-            data_dict[covariate] = values
+        # the equally spaced grids of all the numeric covariates are computed at once,
+        # with a single pass for the minimum and the maximum
+        if numeric_covariates:
+            numeric_data = observed_data[numeric_covariates].to_numpy(dtype=float)
+            grids = np.linspace(
+                numeric_data.min(axis=0), numeric_data.max(axis=0), kwargs.get("num", 50)
+            )
+            for covariate, values in zip(numeric_covariates, grids.T):
+                data_dict[covariate] = values
+
+        # keep the order in which the covariates were passed
+        data_dict = {covariate: data_dict[covariate] for covariate in condition.covariates.values()}
 
     if variable:
         data_dict[variable.name] = variable.values
 
     # set typical values as defaults for unspecified covariates
     data_dict = set_default_values(model, data_dict)
-    data_grid = _pairwise_grid(data_dict)
 
     # can't enforce dtype on 'with respect to' variable for 'slopes' as it
     # may remove floating point in the epsilon
     effect = kwargs.get("effect_type", None)
     if effect == "slopes":
-        except_col = variable.name
+        dtypes = None
     else:
-        except_col = None
+        dtypes = observed_data.dtypes
 
-    data_grid = enforce_dtypes(observed_data, data_grid, except_col)
+    # the dtypes of the observed data are enforced as the columns of the grid are created
+    data_grid = _pairwise_grid(data_dict, dtypes)
 
     # after computing default values, fractional values may have been computed.
     # Enforcing the dtype of "int" may create duplicate rows as it will round
@@ -104,7 +101,7 @@ def create_grid(
     return data_grid.reset_index(drop=True)
 
 
-def _pairwise_grid(data_dict: dict) -> pd.DataFrame:
+def _pairwise_grid(data_dict: dict, dtypes: Union[pd.Series, None] = None) -> pd.DataFrame:
     """Creates a pairwise grid (cartesian product) of data by using the
     key-values of the dictionary
 
@@ -113,6 +110,9 @@ def _pairwise_grid(data_dict: dict) -> pd.DataFrame:
     data_dict : dict
         A dictionary containing the covariates as keys and their values as the
         values.
+    dtypes : pd.Series, optional
+        The dtypes of the observed data. If passed, the columns in it are cast to
+        their observed dtype when they are created.
 
     Returns
     -------
@@ -121,11 +121,27 @@ def _pairwise_grid(data_dict: dict) -> pd.DataFrame:
         generate predictions.
     """
     keys, values = zip(*data_dict.items())
-    cross_joined_data = pd.DataFrame([dict(zip(keys, v)) for v in itertools.product(*values)])
+    # The columns are built with NumPy instead of creating a dictionary for each row.
+    # With 'ij' indexing, the last variable varies the fastest, as in 'itertools.product'.
+    grids = np.meshgrid(*[np.asarray(value) for value in values], indexing="ij")
+
+    columns = {}
+    for key, grid in zip(keys, grids):
+        column = grid.ravel()
+        if dtypes is not None and key in dtypes.index:
+            if dtypes[key] == "category":
+                # explicitly converts to category dtype
+                column = pd.Series(column).astype("category")
+            else:
+                # casts the original dtype to the new data
+                column = pd.Series(column).astype(dtypes[key])
+        columns[key] = column
+
+    cross_joined_data = pd.DataFrame(columns)
     return cross_joined_data
 
 
-def _differences_unit_level(variable_info: VariableInfo, effect_type: str) -> pd.DataFrame:
+def _differences_unit_level(variable_info: VariableInfo) -> pd.DataFrame:
     """Creates the data for unit-level contrasts by using the observed (empirical)
     data. All covariates in the model are included in the data, except for the
     contrast predictor. The contrast predictor is replaced with either: (1) the
@@ -136,8 +152,6 @@ def _differences_unit_level(variable_info: VariableInfo, effect_type: str) -> pd
     variable_info : VariableInfo
         Information about the variable of interest. This is `contrast` for
         'comparisons' and `wrt` for 'slopes'.
-    effect_type : str
-        The type of effect being computed. Either "comparisons" or "slopes".
 
     Returns
     -------
@@ -148,20 +162,20 @@ def _differences_unit_level(variable_info: VariableInfo, effect_type: str) -> pd
     """
     covariates = get_model_covariates(variable_info.model)
     df = variable_info.model.data[covariates].drop(labels=variable_info.name, axis=1)
-    variable_vals = variable_info.values
-
-    if effect_type == "comparisons":
-        variable_vals = np.array(variable_info.values)[..., None]
-        variable_vals = np.repeat(variable_vals, variable_info.model.data.shape[0], axis=1)
 
-    unit_level_df_dict = {}
-    for idx, value in enumerate(variable_vals):
-        unit_level_df_dict[f"contrast_{idx}"] = df.copy()
-        unit_level_df_dict[f"contrast_{idx}"][variable_info.name] = value
+    # Each value of the variable of interest is either a scalar or a vector with one value per
+    # observation. Both are broadcasted to a (values, observations) array so the column of
+    # the variable of interest is built at once.
+    variable_vals = np.asarray(variable_info.values)
+    if variable_vals.ndim == 1:
+        variable_vals = variable_vals[..., np.newaxis]
+    variable_vals = np.broadcast_to(variable_vals, (len(variable_vals), df.shape[0]))
 
-    unit_level_df = pd.concat(unit_level_df_dict.values())
+    # The observed data is stacked once for all the values instead of copying it for each one
+    unit_level_df = pd.concat([df] * len(variable_vals), ignore_index=True)
+    unit_level_df[variable_info.name] = variable_vals.ravel()
 
-    return unit_level_df.reset_index(drop=True)
+    return unit_level_df
 
 
 def create_differences_data(
@@ -190,7 +204,7 @@ def create_differences_data(
         passed into the `conditional` argument.
     """
     if not condition_info.covariates:
-        return _differences_unit_level(variable_info, effect_type)
+        return _differences_unit_level(variable_info)
 
     return create_grid(condition_info, variable_info, effect_type=effect_type)
 
@@ -232,9 +246,10 @@ def set_default_values(model: Model, data_dict: dict) -> dict:
     for name in unique_covariates:
         if name not in data_dict:
             x = model.data[name]
-            if is_numeric_dtype(x) or is_integer_dtype(x) or is_float_dtype(x):
+            kind = get_variable_kind(x)
+            if kind == "numeric":
                 data_dict[name] = np.array([np.mean(x)])
-            elif is_categorical_dtype(x) or is_string_dtype(x) or is_object_dtype(x):
+            elif kind == "categoric":
                 data_dict[name] = np.array([mode(x)])
             else:
                 raise TypeError(f"Unsupported data type of {x.dtype} for covariate '{name}'")
@@ -1,13 +1,11 @@
 # pylint: disable=ungrouped-imports
 from dataclasses import dataclass, field
 import itertools
-from typing import Dict, Union
+from typing import Union
 
 import arviz as az
 import numpy as np
 import pandas as pd
-from pandas.api.types import is_categorical_dtype, is_string_dtype
-import xarray as xr
 
 from bambi.models import Model
 from bambi.interpret.create_data import create_differences_data, create_predictions_data
@@ -15,8 +13,10 @@ from bambi.interpret.utils import (
     average_over,
     ConditionalInfo,
     enforce_dtypes,
+    get_variable_kind,
+    hdi,
     identity,
-    merge,
+    predict_from_posterior,
     VariableInfo,
 )
 from bambi.utils import get_aliased_name
@@ -24,8 +24,8 @@ from bambi.utils import get_aliased_name
 
 SUPPORTED_SLOPES = ("dydx", "eyex")
 SUPPORTED_COMPARISONS = {
-    "diff": lambda x, y: x - y,
-    "ratio": lambda x, y: x / y,
+    "diff": np.subtract,
+    "ratio": np.divide,
 }
 
 
@@ -83,46 +83,30 @@ class Estimate:
 
     Parameters
     ----------
-    mean : Dict[str, xr.DataArray]
-        The mean of the posterior distribution (chains and draws).
-    bounds : Dict[str, xr.Dataset]
-        The uncertainty interval of the posterior distribution (chains and draws).
+    mean : np.ndarray
+        The mean of the posterior distribution (chains and draws). The first dimension
+        indexes the estimates.
+    bounds : np.ndarray
+        The uncertainty interval of the posterior distribution (chains and draws). The first
+        dimension indexes the lower and upper bound and the second one indexes the estimates.
     use_hdi : bool
         Whether to use the highest density interval (HDI) (True) or quantiles (False).
     """
 
-    mean: Dict[str, xr.DataArray]
-    bounds: Dict[str, xr.Dataset]
+    mean: np.ndarray
+    bounds: np.ndarray
     use_hdi: bool
-    bounds_list: list = field(init=False)
-    lower: xr.DataArray = field(init=False)
-    higher: xr.DataArray = field(init=False)
+    lower: np.ndarray = field(init=False)
+    higher: np.ndarray = field(init=False)
 
     def __post_init__(self):
         """
-        Parses the mean and bounds dictionaries into arrays for inserting
-        the 'mean', 'lower', and 'upper' columns into the summary dataframe.
+        Parses the mean and bounds into arrays for inserting the 'mean', 'lower',
+        and 'upper' columns into the summary dataframe.
         """
-        self.bounds_list = [self.bounds[key] for key in self.bounds]
-        self.mean = np.array(list(self.mean.values())).flatten()
-
-        if self.use_hdi:
-            data_var = list(self.bounds_list[0].data_vars)[0]
-            self.lower = np.array(
-                [self.bounds[key][data_var].sel(hdi="lower") for key in self.bounds]
-            ).flatten()
-            self.higher = np.array(
-                [self.bounds[key][data_var].sel(hdi="higher") for key in self.bounds]
-            ).flatten()
-        else:
-            lower = self.bounds_list[0].coords["quantile"].values[0]
-            higher = self.bounds_list[0].coords["quantile"].values[1]
-            self.lower = np.array(
-                [self.bounds[key].sel(quantile=lower) for key in self.bounds]
-            ).flatten()
-            self.higher = np.array(
-                [self.bounds[key].sel(quantile=higher) for key in self.bounds]
-            ).flatten()
+        # 'ravel' only copies when the array is not contiguous, unlike 'flatten'
+        self.mean = np.ravel(self.mean)
+        self.lower, self.higher = self.bounds.reshape(2, -1)
 
 
 # pylint: disable=consider-iterating-dictionary
@@ -169,8 +153,9 @@ class PredictiveDifferences:
     estimate: Estimate = field(init=False)
     summary_df: pd.DataFrame = field(init=False)
     contrast_values: list = field(init=False)
+    masks: np.ndarray = field(init=False)
 
-    def set_variable_values(self, draws: dict) -> np.ndarray:
+    def set_variable_values(self, draws: dict) -> list:
         """
         Obtain pairwise combinations of the 'draws' keys. The dictionary keys
         represent the variable of interest's values. If 'comparisons', then
@@ -180,51 +165,60 @@ class PredictiveDifferences:
         """
 
         # obtain pairwise combinations of the variable of interest's values (keys)
-        keys = np.array(list(draws.keys()))
+        keys = list(draws)
         pairwise_variables = list(itertools.combinations(keys, 2))
 
         # if 'slopes' and user passed their own values, then need to index the
         # original data, and the original data plus 'eps'
         if self.kind == "slopes" and self.variable.user_passed:
-            original_data, original_data_plus_eps = (
-                keys[: self.variable.passed_values.size],
-                keys[self.variable.passed_values.size :],
-            )
-            pairwise_variables = np.dstack((original_data, original_data_plus_eps))[0]
-            self.variable.values = self.variable.values.reshape(2, self.variable.passed_values.size)
+            n_passed = self.variable.passed_values.size
+            original_data, original_data_plus_eps = keys[:n_passed], keys[n_passed:]
+            pairwise_variables = list(zip(original_data, original_data_plus_eps))
+            self.variable.values = self.variable.values.reshape(2, n_passed)
+            self.masks = self.get_masks()
 
         return pairwise_variables
 
+    def get_masks(self) -> np.ndarray:
+        """
+        Obtain a boolean mask for each value of the variable of interest, or for each row
+        of values if they are 2D. A mask selects the rows of 'preds_data' where the variable
+        of interest takes that value (or one of the values in that row). The column is
+        factorized once, so each mask is a comparison of integer codes instead of a pandas
+        'isin' on the column.
+
+        The masks are stored in 'masks' by 'get_estimate' so 'get_summary_df' can reuse
+        them. They must be obtained again whenever the variable values are reshaped.
+        """
+        codes, uniques = pd.factorize(self.preds_data[self.variable.name])
+        masks = []
+        for values in self.variable.values:
+            values_codes = uniques.get_indexer(np.atleast_1d(values))
+            masks.append(np.isin(codes, values_codes[values_codes >= 0]))
+        return np.stack(masks)
+
     def get_slope_estimate(
         self,
-        predictive_difference: xr.DataArray,
+        predictive_difference: np.ndarray,
         pair: tuple,
         draws: dict,
         slope: str,
         eps: float,
-        wrt_x: xr.DataArray,
-    ) -> xr.DataArray:
+        wrt_x: dict,
+    ) -> np.ndarray:
         """
-        Computes the slope estimate for 'dydx', 'dyex', 'eyex', 'eydx'.
+        Computes the slope estimate for 'dydx', 'dyex', 'eyex', 'eydx'. The
+        'predictive_difference' array is modified in place and returned.
         """
-        predictive_difference = (predictive_difference / eps).rename(self.response.name_target)
+        # 'predictive_difference' is not shared with the draws, so it's updated in place.
+        # This avoids one temporary array of the size of the posterior for each operation.
+        predictive_difference /= eps
 
         if slope in ("eyex", "dyex"):
-            wrt_x = xr.DataArray(
-                wrt_x[pair[1]],
-                coords={self.response.name_obs: np.arange(0, len(wrt_x[pair[1]]))},
-                dims=[self.response.name_obs],
-            )
+            predictive_difference *= wrt_x[pair[1]]
 
         if slope in ("eyex", "eydx"):
-            y_hat = draws[pair[1]]
-
-        if slope == "eyex":
-            predictive_difference = predictive_difference * (wrt_x / y_hat)
-        elif slope == "eydx":
-            predictive_difference = predictive_difference * (1 / y_hat)
-        elif slope == "dyex":
-            predictive_difference = predictive_difference * wrt_x
+            predictive_difference /= draws[pair[1]]
 
         return predictive_difference
 
@@ -279,47 +273,55 @@ class PredictiveDifferences:
         else:
             self.estimate_name = comparison_type
 
-        if self.variable.values.ndim == 1:
-            self.variable.values = np.array(self.variable.values).reshape(-1, 1)
+        # The posterior is pulled out as an array once, with the observations in the third
+        # axis, so each group is a boolean index instead of an xarray selection.
+        posterior = idata.posterior[self.response.name_target].transpose(
+            "chain", "draw", self.response.name_obs, ...
+        )
+        posterior = posterior.to_numpy()
+
+        self.masks = self.get_masks()
+
+        # Values of the variable of interest, with observations in the third axis so they
+        # broadcast over the remaining dimensions of the posterior
+        variable_values = self.preds_data[self.variable.name].to_numpy()
+        variable_values = variable_values.reshape((-1,) + (1,) * (posterior.ndim - 3))
 
         draws = {}
         variable_data = {}
-        for idx, _ in enumerate(self.variable.values):
-            mask = np.array(self.preds_data[self.variable.name].isin(self.variable.values[idx]))
-            select_draw = response_transforms(
-                idata.posterior[self.response.name_target].sel({self.response.name_obs: mask})
-            )
-            select_draw = select_draw.assign_coords(
-                {self.response.name_obs: np.arange(len(select_draw.coords[self.response.name_obs]))}
-            )
-            draws[f"mask_{idx}"] = select_draw
+        for idx, mask in enumerate(self.masks):
+            draws[f"mask_{idx}"] = response_transforms(posterior[:, :, mask])
 
             if slope in ("eyex", "dyex"):
-                variable_data[f"mask_{idx}"] = self.preds_data[
-                    self.preds_data[self.variable.name].isin(self.variable.values[idx])
-                ][self.variable.name]
+                variable_data[f"mask_{idx}"] = variable_values[mask]
 
         pairwise_variables = self.set_variable_values(draws)
 
-        difference_mean = {}
-        difference_bounds = {}
+        # All the pairwise differences have the same shape, so they are written into a
+        # preallocated (chain, draw, estimate, ...) array and summarized in a single call
+        # instead of once per pair.
+        draw = next(iter(draws.values()))
+        differences = np.empty(
+            draw.shape[:2] + (len(pairwise_variables),) + draw.shape[2:],
+            dtype=np.result_type(*draws.values()),
+        )
         for idx, pair in enumerate(pairwise_variables):
             # comparisons effects
-            predictive_difference = function(draws[pair[1]], draws[pair[0]])
+            function(draws[pair[1]], draws[pair[0]], out=differences[:, :, idx])
             # slope effects
             if self.kind == "slopes":
-                predictive_difference = self.get_slope_estimate(
-                    predictive_difference, pair, draws, slope, eps, variable_data
+                self.get_slope_estimate(
+                    differences[:, :, idx], pair, draws, slope, eps, variable_data
                 )
 
-            difference_mean[f"estimate_{idx}"] = predictive_difference.mean(("chain", "draw"))
+        difference_mean = differences.mean(axis=(0, 1))
 
-            if self.use_hdi:
-                difference_bounds[f"estimate_{idx}"] = az.hdi(predictive_difference, prob)
-            else:
-                difference_bounds[f"estimate_{idx}"] = predictive_difference.quantile(
-                    q=(self.response.lower_bound, self.response.upper_bound), dim=("chain", "draw")
-                )
+        if self.use_hdi:
+            difference_bounds = hdi(differences, prob)
+        else:
+            difference_bounds = np.quantile(
+                differences, (self.response.lower_bound, self.response.upper_bound), axis=(0, 1)
+            )
 
         self.estimate = Estimate(difference_mean, difference_bounds, self.use_hdi)
 
@@ -347,55 +349,63 @@ class PredictiveDifferences:
             for 'comparisons' and 'slopes', then a subset of the 'preds' data is used
             to build the summary.
         """
+        n_levels = len(response_dim)
+        # The covariates are the same for every value of the variable of interest, so the rows
+        # of the first mask are used instead of hashing all the rows to drop the duplicates.
+        # It also keeps repeated covariate rows of unit level data, that have their own estimate
+        covariates_df = (
+            self.preds_data[self.masks[0]].drop(columns=self.variable.name).reset_index(drop=True)
+        )
         # scenario 1
         if len(self.variable.values) > 2 and self.kind == "comparisons":
-            summary_df = self.preds_data.drop(columns=self.variable.name).drop_duplicates()
-            covariates_cols = summary_df.columns
-            contrast_values = list(itertools.combinations(self.variable.values.flatten(), 2))
-            covariate_vals = np.tile(summary_df.T, len(contrast_values))
-            summary_df = pd.DataFrame(data=covariate_vals.T, columns=covariates_cols)
-            contrast_values = np.repeat(
-                contrast_values, summary_df.shape[0] // len(contrast_values), axis=0
-            )
-            contrast_values = [tuple(elem) for elem in contrast_values]
+            summary_df = covariates_df
+            combinations = list(itertools.combinations(self.variable.values.flatten(), 2))
+            # Rows are repeated by position, which keeps the dtype of each column
+            n_rows = summary_df.shape[0]
+            summary_df = summary_df.iloc[np.tile(np.arange(n_rows), len(combinations))]
+            summary_df = summary_df.reset_index(drop=True)
+            contrast_values = [
+                combinations[idx] for idx in np.repeat(range(len(combinations)), n_rows)
+            ]
         # scenario 2
-        elif len(response_dim) > 1:
-            summary_df = self.preds_data.drop(columns=self.variable.name).drop_duplicates()
+        elif n_levels > 1:
+            summary_df = covariates_df
             covariates_cols = summary_df.columns
             contrast_values = self.variable.values.flatten()
-            covariate_vals = np.repeat(summary_df.T, len(response_dim))
+            covariate_vals = np.repeat(summary_df.T, n_levels)
             summary_df = pd.DataFrame(data=covariate_vals.T, columns=covariates_cols)
-            summary_df["estimate_dim"] = np.tile(
-                response_dim, summary_df.shape[0] // len(response_dim)
-            )
-            contrast_values = [tuple(contrast_values)] * summary_df.shape[0]
+            n_rows = summary_df.shape[0]
+            summary_df["estimate_dim"] = np.tile(response_dim, n_rows // n_levels)
+            contrast_values = [tuple(contrast_values)] * n_rows
         # scenario 3 & 4
         else:
+            variable_values = self.preds_data[self.variable.name].to_numpy()
             wrt = {}
-            for idx, _ in enumerate(self.variable.values):
-                mask = np.array(self.preds_data[self.variable.name].isin(self.variable.values[idx]))
-                wrt[f"draw_mask_{idx}"] = self.preds_data[mask][self.variable.name].reset_index(
-                    drop=True
-                )
-                # only need to get "a" dataframe since remaining N dataframes are identical
-                if idx == 0:
-                    summary_df = (
-                        self.preds_data[mask]
-                        .drop(columns=self.variable.name)
-                        .reset_index(drop=True)
-                    )
-            contrast_values = pd.concat(wrt.values(), axis=1).apply(tuple, axis=1)
-
-        summary_df.insert(0, "term", self.variable.name)
-        summary_df.insert(1, "estimate_type", self.estimate_name)
-        summary_df.insert(2, "value", contrast_values)
-        summary_df.insert(len(summary_df.columns), "estimate", self.estimate.mean)
-        summary_df.insert(
-            len(summary_df.columns), self.response.lower_bound_name, self.estimate.lower
+            for idx, mask in enumerate(self.masks):
+                wrt[f"draw_mask_{idx}"] = variable_values[mask]
+            summary_df = covariates_df
+            # Pack the values row by row with 'zip' instead of a row-wise pandas 'apply'
+            contrast_values = pd.Series(list(zip(*wrt.values())))
+
+        # The leading and trailing columns are built separately and joined in a single concat,
+        # instead of inserting one column at a time into the covariates frame
+        prefix_df = pd.DataFrame(
+            {
+                "term": self.variable.name,
+                "estimate_type": self.estimate_name,
+                "value": contrast_values,
+            },
+            index=summary_df.index,
         )
-        summary_df.insert(
-            len(summary_df.columns), self.response.upper_bound_name, self.estimate.higher
+        suffix_df = pd.DataFrame(
+            {
+                "estimate": self.estimate.mean,
+                self.response.lower_bound_name: self.estimate.lower,
+                self.response.upper_bound_name: self.estimate.higher,
+            },
+            index=summary_df.index,
         )
+        summary_df = pd.concat([prefix_df, summary_df, suffix_df], axis=1)
 
         self.summary_df = summary_df
         self.contrast_values = contrast_values
@@ -418,17 +428,13 @@ class PredictiveDifferences:
             A dataframe containing the marginal or group by average.
         """
         if variable is True:
-            contrast_df_avg = average_over(self.summary_df, "all")
-            contrast_df_avg.insert(0, "term", self.variable.name)
-            contrast_df_avg.insert(1, "estimate_type", self.estimate_name)
-            if self.kind != "slopes" and len(self.variable.values) < 3:
-                contrast_df_avg.insert(2, "value", self.contrast_values)
-        else:
-            contrast_df_avg = average_over(self.summary_df, variable)
-            contrast_df_avg.insert(0, "term", self.variable.name)
-            contrast_df_avg.insert(1, "estimate_type", self.estimate_name)
-            if self.kind != "slopes" and len(self.variable.values) < 3:
-                contrast_df_avg.insert(2, "value", self.contrast_values)
+            variable = "all"
+
+        contrast_df_avg = average_over(self.summary_df, variable)
+        contrast_df_avg.insert(0, "term", self.variable.name)
+        contrast_df_avg.insert(1, "estimate_type", self.estimate_name)
+        if self.kind != "slopes" and len(self.variable.values) < 3:
+            contrast_df_avg.insert(2, "value", self.contrast_values)
 
         return contrast_df_avg.reset_index(drop=True)
 
@@ -533,50 +539,46 @@ def predictions(
     response_transform = transforms.get(response_name, identity)
 
     if pps:
-        idata = model.predict(
-            idata,
-            data=cap_data,
-            sample_new_groups=sample_new_groups,
-            inplace=False,
-            kind="response",
-        )
-        y_hat = response_transform(idata["posterior_predictive"][response.name])
-        y_hat_mean = y_hat.mean(("chain", "draw"))
+        kind, group, name = "response", "posterior_predictive", response.name
     else:
-        idata = model.predict(
-            idata, data=cap_data, sample_new_groups=sample_new_groups, inplace=False
-        )
-        y_hat = response_transform(idata["posterior"][response.name_target])
-        y_hat_mean = y_hat.mean(("chain", "draw"))
+        kind, group, name = "response_params", "posterior", response.name_target
 
-    if use_hdi and pps:
-        y_hat_bounds = az.hdi(y_hat, prob)[response.name].T
-    elif use_hdi:
-        y_hat_bounds = az.hdi(y_hat, prob)[response.name_target].T
-    else:
-        lower_bound = round((1 - prob) / 2, 4)
-        upper_bound = 1 - lower_bound
-        y_hat_bounds = y_hat.quantile(q=(lower_bound, upper_bound), dim=("chain", "draw"))
+    idata = predict_from_posterior(
+        model, idata, kind=kind, data=cap_data, sample_new_groups=sample_new_groups
+    )
+    y_hat = response_transform(idata[group][name])
 
     lower_bound = round((1 - prob) / 2, 4)
     upper_bound = 1 - lower_bound
     response.lower_bound, response.upper_bound = lower_bound, upper_bound
 
-    cap_data = cap_data.copy()
-    if y_hat_mean.ndim > 1:
-        cap_data = merge(y_hat_mean, y_hat_bounds, cap_data)
-        cap_data = cap_data.rename(
-            columns={
-                f"{response.name}_dim": "estimate_dim",
-                f"{response.name_target}": "estimate",
-                f"{response.name_target}_x": response.lower_bound_name,
-                f"{response.name_target}_y": response.upper_bound_name,
-            }
-        )
+    # The draws are converted to a (chain, draw, obs, ...) array once, and the mean and the
+    # bounds are computed on it without going through xarray reductions
+    y_hat = y_hat.transpose("chain", "draw", response.name_obs, ...)
+    y_hat_dims = y_hat.dims
+    y_hat_coords = y_hat.coords
+    y_hat = y_hat.to_numpy()
+
+    y_hat_mean = y_hat.mean(axis=(0, 1))
+    if use_hdi:
+        y_hat_bounds = hdi(y_hat, prob)
     else:
-        cap_data["estimate"] = y_hat_mean
-        cap_data[response.lower_bound_name] = y_hat_bounds[0]
-        cap_data[response.upper_bound_name] = y_hat_bounds[1]
+        y_hat_bounds = np.quantile(y_hat, (lower_bound, upper_bound), axis=(0, 1))
+
+    columns = {}
+    if y_hat.ndim > 3:
+        # Each row of the data is repeated once per response level, with the levels varying
+        # the fastest, which is the order of the flattened (obs, level) summaries
+        levels = y_hat_coords[y_hat_dims[-1]].to_numpy()
+        cap_data = cap_data.iloc[np.repeat(np.arange(len(cap_data)), len(levels))]
+        columns["estimate_dim"] = np.tile(levels, y_hat.shape[2])
+
+    # 'assign' copies the data once and adds all the columns, instead of a copy
+    # followed by one insertion per column
+    columns["estimate"] = y_hat_mean.ravel()
+    columns[response.lower_bound_name] = y_hat_bounds[0].ravel()
+    columns[response.upper_bound_name] = y_hat_bounds[1].ravel()
+    cap_data = cap_data.assign(**columns)
 
     if average_by is not None:
         if average_by is True:
@@ -669,9 +671,7 @@ def comparisons(
             )
 
     if conditional is None:
-        if is_categorical_dtype(model.data[contrast_name]) or is_string_dtype(
-            model.data[contrast_name]
-        ):
+        if get_variable_kind(model.data[contrast_name]) == "categoric":
             num_levels = len(model.data[contrast_name].unique())
             if num_levels > 2:
                 raise ValueError(
@@ -707,8 +707,8 @@ def comparisons(
     comparisons_data = create_differences_data(
         conditional_info, contrast_info, effect_type="comparisons"
     )
-    idata = model.predict(
-        idata, data=comparisons_data, sample_new_groups=sample_new_groups, inplace=False
+    idata = predict_from_posterior(
+        model, idata, data=comparisons_data, sample_new_groups=sample_new_groups
     )
 
     # returns empty array if model predictions do not have multiple dimensions
@@ -831,7 +831,7 @@ def slopes(
             )
 
     if not isinstance(wrt, dict) and conditional is None:
-        if is_categorical_dtype(model.data[wrt_name]) or is_string_dtype(model.data[wrt_name]):
+        if get_variable_kind(model.data[wrt_name]) == "categoric":
             num_levels = len(model.data[wrt_name].unique())
             if num_levels > 2:
                 raise ValueError(
@@ -853,7 +853,7 @@ def slopes(
     # if wrt is categorical or string dtype, call 'comparisons' to compute the
     # difference between group means as the slope
     effect_type = "slopes"
-    if is_categorical_dtype(model.data[wrt_name]) or is_string_dtype(model.data[wrt_name]):
+    if get_variable_kind(model.data[wrt_name]) == "categoric":
         effect_type = "comparisons"
         eps = None
     wrt_info = VariableInfo(model, wrt, effect_type, grid, eps)
@@ -872,8 +872,8 @@ def slopes(
     response_transform = transforms.get(response_name, identity)
 
     slopes_data = create_differences_data(conditional_info, wrt_info, effect_type)
-    idata = model.predict(
-        idata, data=slopes_data, sample_new_groups=sample_new_groups, inplace=False
+    idata = predict_from_posterior(
+        model, idata, data=slopes_data, sample_new_groups=sample_new_groups
     )
 
     # returns empty array if model predictions do not have multiple dimensions
@@ -5,15 +5,33 @@ from arviz.plots.backends.matplotlib import create_axes_grid
 from arviz.plots.plot_utils import default_grid
 import numpy as np
 import pandas as pd
-from pandas.api.types import is_categorical_dtype, is_numeric_dtype, is_string_dtype
 
 from bambi.models import Model
 from bambi.interpret.effects import comparisons, slopes, predictions
 from bambi.interpret.plot_types import plot_categoric, plot_numeric
-from bambi.interpret.utils import get_covariates, ConditionalInfo
+from bambi.interpret.utils import get_covariates, get_variable_kind, ConditionalInfo
 from bambi.utils import get_aliased_name, listify
 
 
+def _get_figure_and_axes(data: pd.DataFrame, covariates, ax=None, fig_kwargs=None):
+    """
+    Returns the figure and an array with the axes used to plot `data`.
+
+    If `ax` is `None`, a grid with one axes per panel is created. Otherwise, `ax` is
+    normalized to an array and the figure is obtained from its first element, regardless
+    of the number of dimensions.
+    """
+    if ax is None:
+        fig_kwargs = {} if fig_kwargs is None else fig_kwargs
+        panels_n = data[covariates.panel].nunique() if covariates.panel else 1
+        rows, cols = default_grid(panels_n)
+        fig, axes = create_axes_grid(panels_n, rows, cols, backend_kwargs=fig_kwargs)
+        return fig, np.atleast_1d(axes)
+
+    axes = np.atleast_1d(ax)
+    return axes.flat[0].get_figure(), axes
+
+
 def _plot_differences(
     model: Model,
     conditional_info: ConditionalInfo,
@@ -46,29 +64,17 @@ def _plot_differences(
 
     response_name = get_aliased_name(model.response_component.term)
 
-    if ax is None:
-        fig_kwargs = {} if fig_kwargs is None else fig_kwargs
-        panels_n = len(np.unique(summary_df[covariates.panel])) if covariates.panel else 1
-        rows, cols = default_grid(panels_n)
-        fig, axes = create_axes_grid(panels_n, rows, cols, backend_kwargs=fig_kwargs)
-        axes = np.atleast_1d(axes)
-    else:
-        axes = np.atleast_1d(ax)
-        if isinstance(axes[0], np.ndarray):
-            fig = axes[0][0].get_figure()
-        else:
-            fig = axes[0].get_figure()
+    fig, axes = _get_figure_and_axes(summary_df, covariates, ax, fig_kwargs)
 
-    if is_numeric_dtype(summary_df[covariates.main]):
+    main_kind = get_variable_kind(summary_df[covariates.main])
+    if main_kind == "numeric":
         # main condition variable can be numeric but at the same time only
         # a few values, so it is treated as categoric
-        if np.unique(summary_df[covariates.main]).shape[0] <= 5:
+        if summary_df[covariates.main].nunique() <= 5:
             axes = plot_categoric(covariates, summary_df, legend, axes)
         else:
             axes = plot_numeric(covariates, summary_df, transforms, legend, axes)
-    elif is_categorical_dtype(summary_df[covariates.main]) or is_string_dtype(
-        summary_df[covariates.main]
-    ):
+    elif main_kind == "categoric":
         axes = plot_categoric(covariates, summary_df, legend, axes)
     else:
         raise TypeError("Main covariate must be numeric or categoric.")
@@ -209,24 +215,12 @@ def plot_predictions(
 
     response_name = get_aliased_name(model.response_component.term)
 
-    if ax is None:
-        fig_kwargs = {} if fig_kwargs is None else fig_kwargs
-        panels_n = len(np.unique(cap_data[covariates.panel])) if covariates.panel else 1
-        rows, cols = default_grid(panels_n)
-        fig, axes = create_axes_grid(panels_n, rows, cols, backend_kwargs=fig_kwargs)
-        axes = np.atleast_1d(axes)
-    else:
-        axes = np.atleast_1d(ax)
-        if isinstance(axes[0], np.ndarray):
-            fig = axes[0][0].get_figure()
-        else:
-            fig = axes[0].get_figure()
+    fig, axes = _get_figure_and_axes(cap_data, covariates, ax, fig_kwargs)
 
-    if is_numeric_dtype(cap_data[covariates.main]):
+    main_kind = get_variable_kind(cap_data[covariates.main])
+    if main_kind == "numeric":
         axes = plot_numeric(covariates, cap_data, transforms, legend, axes)
-    elif is_categorical_dtype(cap_data[covariates.main]) or is_string_dtype(
-        cap_data[covariates.main]
-    ):
+    elif main_kind == "categoric":
         axes = plot_categoric(covariates, cap_data, legend, axes)
     else:
         raise ValueError("Main covariate must be numeric or categoric.")
@@ -323,9 +317,7 @@ def plot_comparisons(
             )
 
     if not isinstance(contrast, dict):
-        if is_categorical_dtype(model.data[contrast_name]) or is_string_dtype(
-            model.data[contrast_name]
-        ):
+        if get_variable_kind(model.data[contrast_name]) == "categoric":
             contrast_levels = len(model.data[contrast_name].unique())
             if contrast_levels > 2 and average_by is None:
                 raise ValueError(
@@ -482,7 +474,7 @@ def plot_slopes(
             )
 
     if not isinstance(wrt, dict):
-        if is_categorical_dtype(model.data[wrt_name]) or is_string_dtype(model.data[wrt_name]):
+        if get_variable_kind(model.data[wrt_name]) == "categoric":
             num_values = len(model.data[wrt_name].unique())
             if num_values > 2 and average_by is None:
                 raise ValueError(
@@ -2,10 +2,11 @@
 # pylint: disable = too-many-nested-blocks
 from dataclasses import dataclass, field
 from typing import Union
+from weakref import WeakKeyDictionary
 
+import arviz as az
 import numpy as np
 import pandas as pd
-import xarray as xr
 
 from formulae.terms.call import Call
 from formulae.terms.call_resolver import LazyVariable
@@ -15,6 +16,12 @@ from bambi.utils import listify
 from bambi.interpret.logs import log_interpret_defaults
 
 
+# The terms and covariates of a model don't change after it is created, so they are obtained
+# once per model instead of walking the terms on every call of the interpret functions
+MODEL_TERMS = WeakKeyDictionary()
+MODEL_COVARIATES = WeakKeyDictionary()
+
+
 @dataclass
 class VariableInfo:
     """
@@ -104,9 +111,8 @@ class VariableInfo:
 
         If categoric dtype the returned value is the unique levels of 'variable'.
         """
-        values = None  # Otherwise pylint complains
         terms = get_model_terms(self.model)
-        # get default values for each variable in the model
+        # get default values for the variable, stopping at the first component that uses it
         for term in terms.values():
             if hasattr(term, "components"):
                 for component in term.components:
@@ -115,23 +121,21 @@ class VariableInfo:
                         names = [arg.name for arg in component.call.args]
                     else:
                         names = [component.name]
-                    for name in names:
-                        if name == self.name:
-                            predictor_data = self.model.data[name]
-                            dtype = predictor_data.dtype
-                            if component.kind == "numeric":
-                                if self.grid or self.kind == "comparisons":
-                                    predictor_data = np.mean(predictor_data)
-                                if self.kind == "slopes":
-                                    values = self.epsilon_difference(predictor_data, self.eps)
-                                if self.kind == "comparisons":
-                                    values = self.centered_difference(
-                                        predictor_data, self.eps, dtype
-                                    )
-                            elif component.kind == "categoric":
-                                values = np.unique(predictor_data)
-
-        return values
+                    if self.name not in names:
+                        continue
+                    predictor_data = self.model.data[self.name]
+                    if component.kind == "numeric":
+                        dtype = predictor_data.dtype
+                        if self.grid or self.kind == "comparisons":
+                            predictor_data = predictor_data.mean()
+                        if self.kind == "slopes":
+                            return self.epsilon_difference(predictor_data, self.eps)
+                        if self.kind == "comparisons":
+                            return self.centered_difference(predictor_data, self.eps, dtype)
+                    if component.kind == "categoric":
+                        return np.unique(predictor_data)
+
+        return None
 
 
 @dataclass
@@ -211,14 +215,17 @@ def average_over(data: pd.DataFrame, covariate: Union[str, list]) -> pd.DataFram
     if covariate == "all":
         return pd.DataFrame(data[data.columns[-3:]].mean()).T
     else:
-        return data.groupby(covariate, as_index=False)[data.columns[-3:]].mean()
+        return data.groupby(covariate, as_index=False, observed=True)[data.columns[-3:]].mean()
 
 
 def get_model_terms(model: Model) -> dict:
     """
     Loops through the distributional components of a bambi model and
-    returns a dictionary of terms.
+    returns a dictionary of terms. The result is cached for each model.
     """
+    if model in MODEL_TERMS:
+        return MODEL_TERMS[model]
+
     terms = {}
     for component in model.distributional_components.values():
         if component.design.common:
@@ -227,13 +234,17 @@ def get_model_terms(model: Model) -> dict:
         if component.design.group:
             terms.update(component.design.group.terms)
 
+    MODEL_TERMS[model] = terms
     return terms
 
 
 def get_model_covariates(model: Model) -> np.ndarray:
     """
-    Return covariates specified in the model.
+    Return covariates specified in the model. The result is cached for each model.
     """
+    if model in MODEL_COVARIATES:
+        return MODEL_COVARIATES[model]
+
     terms = get_model_terms(model)
     covariates = []
     for term in terms.values():
@@ -263,7 +274,11 @@ def get_model_covariates(model: Model) -> np.ndarray:
     # Don't include non-covariate names (#797)
     flatten_covariates = [name for name in flatten_covariates if name in model.data]
 
-    return np.unique(flatten_covariates)
+    covariates = np.unique(flatten_covariates)
+    # The array is shared between calls, so it must not be modified
+    covariates.flags.writeable = False
+    MODEL_COVARIATES[model] = covariates
+    return covariates
 
 
 def get_covariates(covariates: dict) -> Covariates:
@@ -298,17 +313,28 @@ def enforce_dtypes(
     observed_df: pd.DataFrame, new_df: pd.DataFrame, except_col=None
 ) -> pd.DataFrame:
     """
-    Enforce dtypes of the observed data to the new data.
+    Enforce dtypes of the observed data to the new data. The column `except_col`, if any,
+    keeps its dtype.
     """
     observed_dtypes = observed_df.dtypes
+    new_dtypes = new_df.dtypes
+    dtypes = {}
     for col in new_df.columns:
-        if col in observed_dtypes.index and not except_col:
-            if observed_dtypes[col] == "category":
-                # explicitly converts to category dtype
-                new_df[col] = new_df[col].astype("category")
-            else:
-                # casts the original dtype to the new data
-                new_df[col] = new_df[col].astype(observed_dtypes[col])
+        if col == except_col or col not in observed_dtypes.index:
+            continue
+        if observed_dtypes[col] == "category":
+            # explicitly converts to category dtype
+            dtype = "category"
+        else:
+            # casts the original dtype to the new data
+            dtype = observed_dtypes[col]
+        # Columns that already have the right dtype are left untouched
+        if new_dtypes[col] != dtype:
+            dtypes[col] = dtype
+
+    # All the columns are cast in a single call, instead of one assignment per column
+    if dtypes:
+        new_df = new_df.astype(dtypes)
 
     return new_df
 
@@ -326,26 +352,60 @@ def identity(x):
     return x
 
 
-def merge(y_hat_mean: xr.DataArray, y_hat_bounds: xr.DataArray, data: pd.DataFrame) -> pd.DataFrame:
+def get_variable_kind(x: pd.Series) -> Union[str, None]:
+    """
+    Returns 'numeric' or 'categoric' depending on the dtype of `x`, or `None` if the dtype
+    is not supported. The kind of the dtype is checked directly, instead of going through
+    the 'is_*_dtype' functions of pandas.
+    """
+    dtype = x.dtype
+    if dtype.kind in "biufc":
+        return "numeric"
+    # categorical, string, and object dtypes
+    if isinstance(dtype, pd.CategoricalDtype) or dtype.kind in "OSU":
+        return "categoric"
+    return None
+
+
+def predict_from_posterior(model: Model, idata: az.InferenceData, **kwargs) -> az.InferenceData:
+    """
+    Obtain predictions with 'model.predict' in a new InferenceData that only contains a
+    shallow copy of the posterior of 'idata'.
+
+    'model.predict(..., inplace=False)' makes a deep copy of all the groups in 'idata', but
+    predictions only need the posterior. The variables of the original posterior are
+    never modified, so they can be shared.
     """
-    Convert predictions ('y_hat_mean' and 'y_hat_bounds') into dataframes and join
-    with the original data used to perform predictions. This will "duplicate" the
-    data to ensure that the original data is aligned with each response dimension
-    (level).
+    idata = az.InferenceData(posterior=idata.posterior.copy())
+    model.predict(idata, inplace=True, **kwargs)
+    return idata
+
+
+def hdi(draws: np.ndarray, prob: float) -> np.ndarray:
+    """
+    Compute the highest density interval of an array of draws with shape
+    (chain, draw, ...) and return an array with shape (2, ...) with the lower
+    and higher bounds.
+
+    It gives the same result as 'az.hdi', but the draws of all the elements are
+    sorted at once and the narrowest interval of each element is found with
+    array operations instead of a Python loop over the elements.
     """
+    if not 1 >= prob > 0:
+        raise ValueError("The value of 'prob' should be in the interval (0, 1]")
 
-    idx_names = y_hat_mean.to_dataframe().index.names
+    shape = draws.shape[2:]
+    draws = np.sort(draws.reshape((-1,) + shape), axis=0)
 
-    yhat_df = y_hat_mean.to_dataframe().reset_index().set_index(idx_names)
-    lower_df = y_hat_bounds.sel(hdi="lower").to_dataframe().reset_index().set_index(idx_names)
-    higher_df = y_hat_bounds.sel(hdi="higher").to_dataframe().reset_index().set_index(idx_names)
-    bounds_df = pd.merge(left=lower_df, right=higher_df, left_index=True, right_index=True)
-    preds_df = (
-        pd.merge(left=yhat_df, right=bounds_df, left_index=True, right_index=True)
-        .reset_index()
-        .set_index(idx_names[0])
-    )
+    n_draws = draws.shape[0]
+    interval_idx_inc = int(np.floor(prob * n_draws))
+    n_intervals = n_draws - interval_idx_inc
+    interval_width = np.subtract(draws[interval_idx_inc:], draws[:n_intervals], dtype=np.float64)
 
-    summary_df = pd.merge(left=data, right=preds_df, left_index=True, right_index=True)
+    if n_intervals == 0:
+        raise ValueError("Too few elements for interval calculation.")
 
-    return summary_df.drop(columns=["hdi_x", "hdi_y"])
+    min_idx = np.argmin(interval_width, axis=0)[np.newaxis]
+    lower = np.take_along_axis(draws, min_idx, axis=0)
+    higher = np.take_along_axis(draws, min_idx + interval_idx_inc, axis=0)
+    return np.concatenate([lower, higher])
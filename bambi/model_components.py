@@ -2,6 +2,8 @@ import formulae as fm
 import numpy as np
 import xarray as xr
 
+from scipy import sparse
+
 from bambi.defaults import get_default_prior
 from bambi.families import univariate, multivariate
 from bambi.priors import Prior
@@ -55,6 +57,16 @@ class DistributionalComponent:
 
     def __init__(self, name, design, priors, spec, is_parent):
         self.terms = {}
+        # Terms are also stored by kind when they're added, so the properties that return
+        # them don't have to filter 'self.terms' every time they're accessed
+        self._intercept_term = None
+        self._common_terms = {}
+        self._offset_terms = {}
+        self._group_specific_terms = {}
+        self._group_specific_groups = {}
+        self._hsgp_terms = {}
+        self._common_columns = None
+        self._group_design_matrix = None
         self.alias = None
         self.name = name
         self.design = design
@@ -65,6 +77,7 @@ class DistributionalComponent:
         if self.design.common:
             self.add_common_terms(priors)
             self.add_hsgp_terms(priors)
+            self._common_columns = self._get_common_columns()
 
         if self.design.group:
             self.add_group_specific_terms(priors)
@@ -83,20 +96,25 @@ class DistributionalComponent:
                     )
 
             if term.kind == "offset":
-                self.terms[name] = OffsetTerm(term, self.prefix)
+                self.terms[name] = self._offset_terms[name] = OffsetTerm(term, self.prefix)
+            elif term.kind == "intercept":
+                self.terms[name] = self._intercept_term = CommonTerm(term, prior, self.prefix)
             else:
-                self.terms[name] = CommonTerm(term, prior, self.prefix)
+                self.terms[name] = self._common_terms[name] = CommonTerm(term, prior, self.prefix)
 
     def add_group_specific_terms(self, priors):
         for name, term in self.design.group.terms.items():
             prior = priors.pop(name, priors.get("group_specific", None))
             self.terms[name] = GroupSpecificTerm(term, prior, self.prefix)
+            self._group_specific_terms[name] = self.terms[name]
+            factor = name.split("|")[1]
+            self._group_specific_groups.setdefault(factor, []).append(name)
 
     def add_hsgp_terms(self, priors):
         for name, term in self.design.common.terms.items():
             if is_hsgp_term(term):
                 prior = priors.pop(name, None)
-                self.terms[name] = HSGPTerm(term, prior, self.prefix)
+                self.terms[name] = self._hsgp_terms[name] = HSGPTerm(term, prior, self.prefix)
 
     def build_priors(self):
         for term in self.terms.values():
@@ -151,8 +169,10 @@ class DistributionalComponent:
             to_stack_dims = to_stack_dims + (response_levels_dim,)
             linear_predictor_dims = linear_predictor_dims + (response_levels_dim,)
 
+        # The first contribution is assigned, not added, so the following ones are added in
+        # place to the array it returns instead of allocating a new one
         if self.design.common:
-            linear_predictor += self.predict_common(
+            linear_predictor = self.predict_common(
                 posterior, data, in_sample, to_stack_dims, design_matrix_dims, hsgp_dict
             )
 
@@ -162,11 +182,14 @@ class DistributionalComponent:
             )
 
         # Sort dimensions
-        linear_predictor = linear_predictor.transpose(*linear_predictor_dims)
+        # The products with the design matrices already use this layout. Only the contributions
+        # of other terms (e.g. HSGP terms) may have their dimensions in a different order.
+        if linear_predictor.dims != linear_predictor_dims:
+            linear_predictor = linear_predictor.transpose(*linear_predictor_dims)
 
         # Add coordinates for the observation number
-        obs_n = len(linear_predictor[response_dim])
-        linear_predictor = linear_predictor.assign_coords({response_dim: list(range(obs_n))})
+        obs_n = linear_predictor.sizes[response_dim]
+        linear_predictor = linear_predictor.assign_coords({response_dim: np.arange(obs_n)})
 
         # Handle more special cases
         if hasattr(self.spec.family, "transform_linear_predictor"):
@@ -174,9 +197,13 @@ class DistributionalComponent:
                 self.spec, linear_predictor, posterior
             )
 
+        # The inverse link works on arrays, so it's applied to the underlying NumPy array and
+        # the result is wrapped with the same dims and coords. It's cheaper than xr.apply_ufunc.
         invlink = self.spec.family.link[self.name].linkinv
         invlink_kwargs = getattr(self.spec.family, "INVLINK_KWARGS", {})
-        response = xr.apply_ufunc(invlink, linear_predictor, kwargs=invlink_kwargs)
+        response = linear_predictor.copy(
+            data=invlink(linear_predictor.to_numpy(), **invlink_kwargs)
+        )
 
         if hasattr(self.spec.family, "transform_coords"):
             response = self.spec.family.transform_coords(self.spec, response)
@@ -198,19 +225,36 @@ class DistributionalComponent:
         else:
             X = self.design.common.evaluate_new_data(data).design_matrix
 
-        # Add offset columns to their own design matrix and remove then from common matrix
+        # Add offset columns to their own design matrix
         for term in self.offset_terms:
-            term_slice = self.design.common.slices[term]
-            x_offsets.append(X[:, term_slice])
-            X = np.delete(X, term_slice, axis=1)
+            x_offsets.append(X[:, self.design.common.slices[term]].ravel())
+
+        # Add contribution due to the common terms
+        # It goes first, so the remaining contributions are added in place to the array it
+        # creates rather than allocating a new array with every sum
+        if self.common_terms or self.intercept_term:
+            X_terms = [get_aliased_name(term) for term in self.common_terms.values()]
+            if self.intercept_term:
+                X_terms.insert(0, get_aliased_name(self.intercept_term))
+            b = stack_posterior_draws(posterior, X_terms, to_stack_dims)
+
+            # Remove columns of X that are associated with offsets and HSGP contributions
+            if not self._common_columns.all():
+                X_common = X[:, self._common_columns]
+            else:
+                X_common = X
+
+            linear_predictor = xr.DataArray(
+                dot_design_matrix(X_common, b),
+                dims=get_linear_predictor_dims(to_stack_dims, response_dim),
+                coords={dim: posterior.coords[dim] for dim in to_stack_dims},
+            )
 
         # Add HSGP components contribution to the linear predictor
-        hsgp_slices = []
         for term_name, term in self.hsgp_terms.items():
             # Extract data for the HSGP component from the design matrix
             term_slice = self.design.common.slices[term_name]
             x_slice = X[:, term_slice]
-            hsgp_slices.append(term_slice)
             term_aliased_name = get_aliased_name(term)
             hsgp_to_stack_dims = (f"{term_aliased_name}_weights_dim",)
 
@@ -255,26 +299,13 @@ class DistributionalComponent:
             # Add contribution to the linear predictor
             linear_predictor += hsgp_contribution
 
-        # Remove columns of X that are associated with HSGP contributions
-        # All the slices _must be_ deleted at the same time. Otherwise the slice objects don't
-        # reflect the right columns of X at the time they're used
-        if hsgp_slices:
-            X = np.delete(X, np.r_[tuple(hsgp_slices)], axis=1)
-
-        if self.common_terms or self.intercept_term:
-            # Create DataArray
-            X_terms = [get_aliased_name(term) for term in self.common_terms.values()]
-            if self.intercept_term:
-                X_terms.insert(0, get_aliased_name(self.intercept_term))
-            b = posterior[X_terms].to_stacked_array("__variables__", to_stack_dims)
-
-            # Add contribution due to the common terms
-            X = xr.DataArray(X, dims=design_matrix_dims)
-            linear_predictor += xr.dot(X, b)
-
         # If model contains offsets, add them directly to the linear predictor
+        # They're accumulated in a single vector, without stacking them into a new matrix
         if x_offsets:
-            linear_predictor += np.column_stack(x_offsets).sum(axis=1)[:, np.newaxis, np.newaxis]
+            offsets = x_offsets[0].copy()
+            for x_offset in x_offsets[1:]:
+                offsets += x_offset
+            linear_predictor += xr.DataArray(offsets, dims=response_dim)
 
         return linear_predictor
 
@@ -282,7 +313,11 @@ class DistributionalComponent:
         self, posterior, data, in_sample, to_stack_dims, design_matrix_dims, sample_new_groups
     ):
         if in_sample:
-            Z = self.design.group.design_matrix
+            # The design matrix of the observed data doesn't change, so it's checked for
+            # sparsity only once
+            if self._group_design_matrix is None:
+                self._group_design_matrix = sparsify_design_matrix(self.design.group.design_matrix)
+            Z = self._group_design_matrix
             u = posterior
         else:
             # We temporarily allow for the evaluation of new groups
@@ -291,7 +326,7 @@ class DistributionalComponent:
             group = self.design.group.evaluate_new_data(data)
             fm.config["EVAL_UNSEEN_CATEGORIES"] = fm_eval_unseen_categories_original
 
-            Z = group.design_matrix
+            Z = sparsify_design_matrix(group.design_matrix)
 
             factors_with_new_levels = group.factors_with_new_levels
             if factors_with_new_levels:
@@ -338,14 +373,31 @@ class DistributionalComponent:
 
             u_arrays.append(u_columns)
 
-        u_dims = ["chain", "draw", "__variables__"]
-        if len(to_stack_dims) == 3:
-            u_dims.insert(2, to_stack_dims[-1])
-
         u = np.concatenate(u_arrays, axis=-1)
-        u = xr.DataArray(u, dims=u_dims)
-        Z = xr.DataArray(Z, dims=design_matrix_dims)
-        return xr.dot(Z, u)
+
+        return xr.DataArray(
+            dot_design_matrix(Z, u),
+            dims=get_linear_predictor_dims(to_stack_dims, design_matrix_dims[0]),
+            coords={dim: posterior.coords[dim] for dim in to_stack_dims},
+        )
+
+    def _get_common_columns(self):
+        """Get the columns of the common design matrix that are multiplied by coefficients
+
+        Offsets and HSGP terms also have columns in the common design matrix, but their
+        contributions are computed separately. The columns are the same for the observed and
+        new data, so the boolean mask is computed once. Since it's based on the slices of the
+        original design matrix, all the columns are removed at once when predicting.
+
+        Returns
+        -------
+        np.ndarray
+            A boolean array with `True` for the columns of the common terms and the intercept.
+        """
+        columns = np.ones(self.design.common.design_matrix.shape[1], dtype=bool)
+        for term_name in list(self.offset_terms) + list(self.hsgp_terms):
+            columns[self.design.common.slices[term_name]] = False
+        return columns
 
     def _construct_u_with_new_groups(self, posterior, to_stack_dims, factors_with_new_levels):
         u_list = []
@@ -453,46 +505,33 @@ class DistributionalComponent:
 
     @property
     def group_specific_groups(self):
-        groups = {}
-        for term_name in self.group_specific_terms:
-            factor = term_name.split("|")[1]
-            if factor not in groups:
-                groups[factor] = [term_name]
-            else:
-                groups[factor].append(term_name)
-        return groups
+        """Return dict mapping each grouping factor to the names of its terms."""
+        return self._group_specific_groups
 
     @property
     def intercept_term(self):
         """Return the intercept term in the model component."""
-        for term in self.terms.values():
-            if isinstance(term, CommonTerm) and term.kind == "intercept":
-                return term
-        return None
+        return self._intercept_term
 
     @property
     def common_terms(self):
         """Return dict of all common effects in the model component."""
-        return {
-            k: v
-            for (k, v) in self.terms.items()
-            if isinstance(v, CommonTerm) and not isinstance(v, OffsetTerm) and v.kind != "intercept"
-        }
+        return self._common_terms
 
     @property
     def group_specific_terms(self):
         """Return dict of all group specific effects in model component."""
-        return {k: v for (k, v) in self.terms.items() if isinstance(v, GroupSpecificTerm)}
+        return self._group_specific_terms
 
     @property
     def offset_terms(self):
         """Return dict of all offset effects in model."""
-        return {k: v for (k, v) in self.terms.items() if isinstance(v, OffsetTerm)}
+        return self._offset_terms
 
     @property
     def hsgp_terms(self):
         """Return dict of all HSGP terms in model."""
-        return {k: v for (k, v) in self.terms.items() if isinstance(v, HSGPTerm)}
+        return self._hsgp_terms
 
 
 class ResponseComponent:
@@ -518,12 +557,20 @@ class ResponseComponent:
         if isinstance(self.spec.family, univariate.Bernoulli):
             if response.kind == "categoric" and response.levels is None and reference is None:
                 raise ValueError("Categoric response must be binary for 'bernoulli' family.")
-            if response.kind == "numeric" and not all(np.isin(response.design_matrix, (0, 1))):
+            if response.kind == "numeric" and not is_binary(response.design_matrix):
                 raise ValueError("Numeric response must be all 0 and 1 for 'bernoulli' family.")
 
         self.term = ResponseTerm(response, self.spec.family)
 
 
+def is_binary(x):
+    """Check all the values in an array are 0 or 1
+
+    It's a single vectorized reduction, unlike iterating over the rows of the array.
+    """
+    return bool(np.all((x == 0) | (x == 1)))
+
+
 def prepare_prior(prior, kind, auto_scale):
     """Helper function to correctly set default priors and auto scaling
 
@@ -551,3 +598,96 @@ def prepare_prior(prior, kind, auto_scale):
     else:
         raise ValueError("'prior' must be instance of Prior or `None`.")
     return prior
+
+
+def sparsify_design_matrix(X):
+    """Convert a design matrix to a sparse matrix when most of its values are zero
+
+    Each row of a group-specific design matrix only has non-zero values in the columns of its
+    own groups, so it's usually very sparse. In that case, a sparse matrix product skips all
+    the zeros.
+
+    Parameters
+    ----------
+    X : np.ndarray
+        The design matrix.
+
+    Returns
+    -------
+    np.ndarray or scipy.sparse.csr_matrix
+        A sparse matrix if less than 10% of the values of `X` are non-zero, otherwise `X`.
+    """
+    if np.count_nonzero(X) < 0.1 * X.size:
+        return sparse.csr_matrix(X)
+    return X
+
+
+def dot_design_matrix(X, coefs):
+    """Multiply a design matrix by the draws of its coefficients
+
+    The product is computed with NumPy on the underlying arrays, which is a batched matrix
+    multiplication that uses BLAS. It's much faster than `xr.dot()` on large posteriors.
+    The design matrix is cast to the floating point type of the draws, so single precision
+    posteriors (e.g. obtained with `floatX="float32"`) are not upcast to double precision.
+
+    Parameters
+    ----------
+    X : np.ndarray or scipy.sparse.csr_matrix
+        The design matrix, of shape `(obs, variables)`.
+    coefs : np.ndarray
+        The draws of the coefficients, of shape `(chain, draw, variables)` or
+        `(chain, draw, levels, variables)` when the response has multiple levels.
+
+    Returns
+    -------
+    np.ndarray
+        An array of shape `(chain, draw, obs)` or `(chain, draw, obs, levels)`.
+    """
+    X = X.astype(coefs.dtype, copy=False)
+    if sparse.issparse(X):
+        # Draws are flattened so the product is a single sparse-dense matrix multiplication.
+        # The result has shape (obs, chain, draw[, levels]) and 'obs' is moved to its place.
+        coefs_flat = coefs.reshape(-1, coefs.shape[-1]).T
+        output = (X @ coefs_flat).reshape(X.shape[0], *coefs.shape[:-1])
+        return np.moveaxis(output, 0, 2)
+    if coefs.ndim == 3:
+        return coefs @ X.T
+    return X @ np.swapaxes(coefs, -1, -2)
+
+
+def stack_posterior_draws(posterior, names, sample_dims):
+    """Stack the draws of multiple variables along a new last axis
+
+    It does the same as `posterior[names].to_stacked_array("__variables__", sample_dims)`, but
+    with NumPy arrays, so no MultiIndex is built for the stacked dimension.
+
+    Parameters
+    ----------
+    posterior : xr.Dataset
+        The posterior draws.
+    names : list of str
+        The names of the variables. Their draws are concatenated in this order.
+    sample_dims : tuple of str
+        The dims that are not stacked. All the variables must have them.
+
+    Returns
+    -------
+    np.ndarray
+        An array of shape `sample_dims` plus one axis for the stacked variables.
+    """
+    arrays = []
+    for name in names:
+        draws = posterior[name]
+        other_dims = [dim for dim in draws.dims if dim not in sample_dims]
+        draws = draws.transpose(*sample_dims, *other_dims).to_numpy()
+        arrays.append(draws.reshape(draws.shape[: len(sample_dims)] + (-1,)))
+    return np.concatenate(arrays, axis=-1)
+
+
+def get_linear_predictor_dims(to_stack_dims, response_dim):
+    """Get the dims of the linear predictor given the dims of the coefficients
+
+    The observation dimension goes after 'chain' and 'draw' and before the dimension of the
+    response levels, if any.
+    """
+    return to_stack_dims[:2] + (response_dim,) + to_stack_dims[2:]
@@ -306,7 +306,10 @@ class Model:
         random_seed : int or list of ints
             A list is accepted if cores is greater than one.
         **kwargs :
-            For other kwargs see the documentation for `PyMC.sample()`.
+            For other kwargs see the documentation for `PyMC.sample()`. For example, the
+            log-probability function can be compiled with the Numba or JAX backends of PyTensor
+            by passing `compile_kwargs={"mode": "NUMBA"}` or `compile_kwargs={"mode": "JAX"}`,
+            which often speeds up sampling with the PyMC samplers.
 
         Returns
         -------
@@ -980,9 +983,9 @@ class Model:
         if response_dim in idata.posterior.dims:
             idata.posterior = idata.posterior.drop_dims(response_dim)
 
-        # Use the first DataArray to get the number of observations
-        obs_n = len(list(means_dict.values())[0].coords.get(response_dim))
-        idata.posterior = idata.posterior.assign_coords({response_dim: list(range(obs_n))})
+        # Reuse the observation coordinate of the first DataArray instead of building a new one
+        obs_values = list(means_dict.values())[0].coords.get(response_dim).to_numpy()
+        idata.posterior = idata.posterior.assign_coords({response_dim: obs_values})
 
         for name, value in means_dict.items():
             idata.posterior[name] = value
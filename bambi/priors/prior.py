@@ -45,10 +45,11 @@ class Prior:
         self.args.update(kwargs_)
 
     def __eq__(self, other):
+        if self is other:
+            return True
         if not isinstance(other, type(self)):
             return False
-        else:
-            return self.__dict__ == other.__dict__
+        return values_equal(self.__dict__, other.__dict__)
 
     def __str__(self):
         args = ", ".join(
@@ -63,6 +64,22 @@ class Prior:
         return self.__str__()
 
 
+def values_equal(a, b):
+    """Compare two values that may be, or contain, numpy arrays
+
+    Comparing dictionaries with `==` compares arrays elementwise, which fails when the arrays
+    have more than one element. Here, dictionaries are compared key by key and arrays are
+    compared with `np.array_equal`.
+    """
+    if isinstance(a, dict) and isinstance(b, dict):
+        if a.keys() != b.keys():
+            return False
+        return all(values_equal(value, b[key]) for key, value in a.items())
+    if isinstance(a, np.ndarray) or isinstance(b, np.ndarray):
+        return np.array_equal(a, b)
+    return a == b
+
+
 def format_arg(value, decimals):
     try:
         outcome = np.round(value, decimals)
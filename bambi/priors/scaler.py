@@ -29,8 +29,11 @@ class PriorScaler:
 
         # Compute mean and std of the response
         if isinstance(self.model.family, (Gaussian, StudentT)):
-            self.response_mean = np.mean(self.response_component.term.data)
-            self.response_std = np.std(self.response_component.term.data)
+            # The mean is reused to get the deviations, so the data isn't traversed once more
+            # to compute the mean again within 'np.std'
+            data = np.asarray(self.response_component.term.data)
+            self.response_mean = np.mean(data)
+            self.response_std = np.sqrt(np.mean(np.square(data - self.response_mean)))
         else:
             self.response_mean = 0
             self.response_std = 1
@@ -49,7 +52,8 @@ class PriorScaler:
         return mu, sigma
 
     def get_slope_sigma(self, x):
-        return self.STD * (self.response_std / np.std(x))
+        # When 'x' has multiple columns, a sigma is computed for each of them
+        return self.STD * (self.response_std / get_std(x))
 
     def scale_response(self):
         # Here we would add cases for other families if we wanted
@@ -101,68 +105,73 @@ class PriorScaler:
                     if all_categoric:
                         sigma = 1
                     else:
-                        sigma = 1 / np.std(term.data, axis=0)
+                        sigma = 1 / get_std(term.data)
                 # Single categorical term
                 elif term.categorical:
                     sigma = 1
                 # Single numerical term
                 else:
-                    sigma = 1 / np.std(term.data, axis=0)
+                    sigma = 1 / get_std(term.data)
             # If not, fall back to the regular case
             else:
                 sigma = self.get_slope_sigma(term.data)
         # It's a term that spans multiple columns of the design matrix
         else:
-            mu = np.zeros(term.data.shape[1])
-            sigma = np.zeros(term.data.shape[1])
+            columns_n = term.data.shape[1]
+            mu = np.zeros(columns_n)
             # Special case for logit/probit links with bernoulli or binomial family
             if isinstance(self.model.family, (Bernoulli, Binomial)) and self.model.family.link[
                 "p"
             ].name in ["logit", "probit"]:
-                # Iterate over columns in the data
-                for i, value in enumerate(term.data.T):
-                    if term.kind == "interaction":
-                        # Distinguish cases where all interaction factor terms are categorical
-                        all_categoric = all(
-                            component.kind == "categoric" for component in term.term.components
-                        )
-                        if all_categoric:
-                            sigma[i] = 1
-                        # It's the std dev of the marginal numerical variable (_not_ by group)
-                        else:
-                            sigma[i] = 1 / np.std(np.sum(term.data, axis=1))
-                    # Single categorical term
-                    elif term.categorical:
-                        sigma[i] = 1
-                    # Single numerical term
+                if term.kind == "interaction":
+                    # Distinguish cases where all interaction factor terms are categorical
+                    all_categoric = all(
+                        component.kind == "categoric" for component in term.term.components
+                    )
+                    if all_categoric:
+                        sigma = np.ones(columns_n)
+                    # It's the std dev of the marginal numerical variable (_not_ by group)
                     else:
-                        sigma[i] = 1 / np.std(term.data, axis=0)
+                        sigma = np.full(columns_n, 1 / get_std(np.sum(term.data, axis=1)))
+                # Single categorical term
+                elif term.categorical:
+                    sigma = np.ones(columns_n)
+                # Single numerical term
+                else:
+                    sigma = 1 / get_std(term.data)
             else:
-                for i, value in enumerate(term.data.T):
-                    sigma[i] = self.get_slope_sigma(value)
+                # The standard deviations of all the columns are computed at once
+                sigma = self.get_slope_sigma(term.data)
 
         # Save and set prior
         self.priors.update({term.name: {"mu": mu, "sigma": sigma}})
         term.prior.update(mu=mu, sigma=sigma)
 
-    def scale_group_specific(self, term):
-        if term.prior.args["sigma"].name != "HalfNormal":
+    def scale_group_specific(self, terms):
+        terms = [term for term in terms if term.prior.args["sigma"].name == "HalfNormal"]
+        if not terms:
             return
 
-        # Handle intercepts
-        if term.kind == "intercept":
+        # Handle intercepts, all of them get the same sigma
+        intercept_terms = [term for term in terms if term.kind == "intercept"]
+        if intercept_terms:
             _, sigma = self.get_intercept_stats()
+            for term in intercept_terms:
+                term.prior.args["sigma"].update(sigma=np.squeeze(np.atleast_1d(sigma)))
+
         # Handle slopes
-        else:
-            # Recreate the corresponding common effect data
-            if len(term.predictor.shape) == 2:
-                data_as_common = term.predictor
-            else:
-                data_as_common = term.predictor[:, None]
-            sigma = np.zeros(data_as_common.shape[1])
-            for i, value in enumerate(data_as_common.T):
-                sigma[i] = self.get_slope_sigma(value)
-        term.prior.args["sigma"].update(sigma=np.squeeze(np.atleast_1d(sigma)))
+        slope_terms = [term for term in terms if term.kind != "intercept"]
+        if slope_terms:
+            # Recreate the corresponding common effect data. The data of all the terms is put
+            # side by side so the sigmas are computed at once, and then split by term.
+            data_as_common = [
+                term.predictor if term.predictor.ndim == 2 else term.predictor[:, None]
+                for term in slope_terms
+            ]
+            sigmas = self.get_slope_sigma(np.column_stack(data_as_common))
+            splits = np.cumsum([data.shape[1] for data in data_as_common])[:-1]
+            for term, sigma in zip(slope_terms, np.split(sigmas, splits)):
+                term.prior.args["sigma"].update(sigma=np.squeeze(sigma))
 
     def scale_threshold(self):
         if isinstance(self.model.family, Cumulative):
@@ -187,21 +196,50 @@ class PriorScaler:
         # Scale response
         self.scale_response()
 
+        # The terms with priors that are scaled automatically are selected before scaling
+        parent_component = self.parent_component
+        common_terms = [
+            term
+            for term in parent_component.common_terms.values()
+            if getattr(term.prior, "auto_scale", False)
+        ]
+        group_specific_terms = [
+            term for term in parent_component.group_specific_terms.values() if term.prior.auto_scale
+        ]
+
         # Scale common terms
-        for term in self.parent_component.common_terms.values():
-            if hasattr(term.prior, "auto_scale") and term.prior.auto_scale:
-                self.scale_common(term)
+        for term in common_terms:
+            self.scale_common(term)
 
         # Scale intercept
-        if self.has_intercept:
-            term = self.parent_component.intercept_term
-            if term.prior.auto_scale:
-                self.scale_intercept(term)
+        intercept_term = parent_component.intercept_term
+        if self.has_intercept and intercept_term.prior.auto_scale:
+            self.scale_intercept(intercept_term)
 
         # Scale group-specific terms
-        for term in self.parent_component.group_specific_terms.values():
-            if term.prior.auto_scale:
-                self.scale_group_specific(term)
+        self.scale_group_specific(group_specific_terms)
 
         # Scale threshold parameters in ordinal families
         self.scale_threshold()
+
+
+def get_std(x):
+    """Get the standard deviation of each column of an array
+
+    Constant columns have a standard deviation of zero, which would result in infinite sigmas
+    for the priors. For those columns, the standard deviation is replaced with 1, so their prior
+    sigma is not scaled by the predictor. Constant columns are detected by their range, because
+    the computed standard deviation may not be exactly zero when the mean is rounded.
+
+    Parameters
+    ----------
+    x : np.ndarray
+        A 1D or 2D array.
+
+    Returns
+    -------
+    np.ndarray
+        The standard deviation of `x`, or of each of its columns if it's a 2D array.
+    """
+    std = np.std(x, axis=0)
+    return np.where(np.ptp(x, axis=0) == 0, 1.0, std)
@@ -1,6 +1,4 @@
 # pylint: disable=no-member
-from functools import partial
-
 import numpy as np
 
 import formulae.terms
@@ -32,6 +30,8 @@ class HSGPTerm(BaseTerm):
         self.prefix = prefix
         self.hsgp_attributes = get_hsgp_attributes(term)
         self.hsgp = None
+        # 'm' doesn't depend on the data, so it's converted to an array only once
+        self._m = np.atleast_1d(np.squeeze(self.hsgp_attributes["m"]))
         properties_names = (
             "c",
             "by_levels",
@@ -46,28 +46,24 @@ class HSGPTerm(BaseTerm):
             "mean",
             "maximum_distance",
         )
-        self.__init_properties(properties_names)
+        self.__init_attributes(properties_names)
         # When prior is none at initialization, then automatic priors are used
         self.automatic_priors = self.prior is None
 
-    def __init_properties(self, names):
-        """Initialize attributes as properties
+    def __init_attributes(self, names):
+        """Initialize attributes from the HSGP attributes
 
-        The properties are taken from the `self.hsgp_attributes` dictionary. This is to avoid
-        writing many @property calls in the class definition.
+        The values are taken from the `self.hsgp_attributes` dictionary and bound to the instance,
+        so they're regular attribute lookups instead of properties that look up the dictionary on
+        every access. They don't change after the term is created.
 
         Parameters
         ----------
         names : Sequence[str]
             The names of the attributes taken from `self.hsgp_attributes`
         """
-
-        def get(self, name):
-            return self.hsgp_attributes[name]
-
         for name in names:
-            get_partial = partial(get, name=name)
-            setattr(self.__class__, name, property(get_partial))
+            setattr(self, name, self.hsgp_attributes[name])
 
     @property
     def term(self):
@@ -77,6 +73,9 @@ class HSGPTerm(BaseTerm):
     def term(self, value):
         assert isinstance(value, formulae.terms.terms.Term)
         self._term = value
+        # The quantities derived from the data of the term are computed on first access
+        self._data_centered = None
+        self._L = None
 
     @property
     def data(self):
@@ -95,33 +94,39 @@ class HSGPTerm(BaseTerm):
 
     @property
     def data_centered(self):
-        if self.by_levels is None:
-            output = self.data - self.mean
-        else:
-            output = self.data - self.mean[self.by]
-        return output
+        if self._data_centered is None:
+            if self.by_levels is None:
+                self._data_centered = self.data - self.mean
+            else:
+                self._data_centered = self.data - self.mean[self.by]
+        return self._data_centered
 
     @property
     def m(self):
         """Get the value of 'm', the number of basis vectors
         It's of shape (term.variables_n, ). It's computed by variable.
         """
-        return np.atleast_1d(np.squeeze(self.hsgp_attributes["m"]))
+        return self._m
 
     @property
     def L(self):
         """Get the value of L
         It's of shape (term.groups_n, term.variables_n). It's computed by variable and group.
         """
-        if self.c is not None:
+        if self.c is None:
+            return self.hsgp_attributes["L"]
+
+        if self._L is None:
+            data_centered = self.data_centered
             if self.by_levels is None:
-                S = np.max(np.abs(self.data - self.mean), axis=0)
+                S = max_abs(data_centered)
             else:
+                by = self.by
                 S = np.zeros_like(self.c, dtype="float")
                 for i in range(len(self.by_levels)):
-                    S[i] = np.max(np.abs(self.data_centered[self.by == i]), axis=0)
-            return S * self.c
-        return self.hsgp_attributes["L"]
+                    S[i] = max_abs(data_centered[by == i])
+            self._L = S * self.c
+        return self._L
 
     @property
     def by(self):
@@ -181,6 +186,25 @@ class HSGPTerm(BaseTerm):
         return None
 
 
+def max_abs(x):
+    """Get the maximum absolute value of each column of an array
+
+    It's equivalent to `np.max(np.abs(x), axis=0)`, but it uses the largest and the smallest
+    value of each column, so there is no intermediate array with the absolute values.
+
+    Parameters
+    ----------
+    x : np.ndarray
+        A 2D array.
+
+    Returns
+    -------
+    np.ndarray
+        A 1D array with as many elements as columns in `x`.
+    """
+    return np.maximum(np.max(x, axis=0), -np.min(x, axis=0))
+
+
 def get_hsgp_attributes(term):
     """Extract HSGP attributes from a model matrix term
 
@@ -211,7 +235,4 @@ def get_hsgp_attributes(term):
         "maximum_distance",
     )
     attrs_original = term.components[0].call.stateful_transform.__dict__
-    attrs = {}
-    for name in names:
-        attrs[name] = attrs_original[name]
-    return attrs
+    return {name: attrs_original[name] for name in names}
@@ -0,0 +1,90 @@
+from os.path import dirname, join
+
+import matplotlib
+import pandas as pd
+import pytest
+
+# The tests never display the figures, so they're drawn with a non-interactive backend
+matplotlib.use("Agg")
+
+import matplotlib.pyplot as plt  # pylint: disable=wrong-import-position
+
+DATA_DIR = join(dirname(__file__), "data")
+
+# Sampler settings for tests that only check names, coords, or messages, not the posterior.
+# The sampler is pinned, so the tests run the same code path in every environment.
+FAST_FIT = {
+    "tune": 20,
+    "draws": 20,
+    "chains": 1,
+    "nuts_sampler": "pymc",
+    "progressbar": False,
+    "compute_convergence_checks": False,
+}
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--quick",
+        action="store_true",
+        default=False,
+        help="skip the tests that sample from the posterior, marked as 'slow'",
+    )
+
+
+def pytest_configure(config):
+    config.addinivalue_line("markers", "slow: the test samples from the posterior")
+
+
+def pytest_collection_modifyitems(config, items):
+    if not config.getoption("--quick"):
+        return
+    skip_slow = pytest.mark.skip(reason="slow tests are skipped with --quick")
+    for item in items:
+        if "slow" in item.keywords:
+            item.add_marker(skip_slow)
+
+
+@pytest.fixture(autouse=True)
+def close_figures():
+    """Close the figures created by a test, so they're not kept open for the whole session"""
+    yield
+    plt.close("all")
+
+
+# The datasets below are read once per test session and shared by all the test modules.
+# Tests that need to modify them must work on a copy.
+@pytest.fixture(scope="session")
+def diabetes_data():
+    data = pd.read_csv(join(DATA_DIR, "diabetes.txt"), sep="\t")
+    data["age_grp"] = 0
+    data.loc[data["AGE"] > 40, "age_grp"] = 1
+    data.loc[data["AGE"] > 60, "age_grp"] = 2
+    return data
+
+
+@pytest.fixture(scope="session")
+def crossed_data():
+    """
+    Group specific effects:
+    10 subjects, 12 items, 5 sites
+    Subjects crossed with items, nested in sites
+    Items crossed with sites
+
+    Common effects:
+    A continuous predictor, a numeric dummy, and a three-level category
+    (levels a,b,c)
+
+    Structure:
+    Subjects nested in dummy (e.g., gender), crossed with threecats
+    Items crossed with dummy, nested in threecats
+    Sites partially crossed with dummy (4/5 see a single dummy, 1/5 sees both
+    dummies)
+    Sites crossed with threecats
+    """
+    return pd.read_csv(join(DATA_DIR, "crossed_random.csv"))
+
+
+@pytest.fixture(scope="session")
+def fast_fit():
+    return FAST_FIT.copy()
@@ -35,31 +35,57 @@ def data_100():
     return data
 
 
-def test_non_distributional_model(my_data):
+# The aliases only change the names of the variables, not the posterior. The models are fitted
+# once, and most aliased versions reuse the draws with the names mapped to the aliases.
+# The model with categories is also fitted with aliases, to check the names from the sampler.
+@pytest.fixture(scope="module")
+def non_distributional_fit(my_data, fast_fit):
+    model = bmb.Model(bmb.Formula("y ~ x"), my_data)
+    idata = model.fit(**fast_fit)
+    return model, idata
+
+
+@pytest.fixture(scope="module")
+def distributional_fit(my_data, fast_fit):
+    model = bmb.Model(bmb.Formula("y ~ x", "sigma ~ x"), my_data)
+    idata = model.fit(**fast_fit)
+    return model, idata
+
+
+@pytest.fixture(scope="module")
+def categories_fit(anes, fast_fit):
+    model = bmb.Model("vote[clinton] ~ age + age:party_id", anes, family="bernoulli")
+    idata = model.fit(**fast_fit)
+    return model, idata
+
+
+@pytest.mark.slow
+def test_non_distributional_model(my_data, non_distributional_fit):
     # Plain model
-    formula = bmb.Formula("y ~ x")
-    model = bmb.Model(formula, my_data)
-    idata = model.fit(tune=100, draws=100)
-    model.predict(idata)
+    model, idata = non_distributional_fit
+    idata = model.predict(idata, inplace=False)
 
     assert list(idata.posterior.coords) == ["chain", "draw", "__obs__"]
     assert set(idata.posterior.data_vars) == {"Intercept", "x", "mu", "sigma"}
     assert list(idata.posterior["mu"].coords) == ["chain", "draw", "__obs__"]
 
     # Model with alises
+    model = bmb.Model(bmb.Formula("y ~ x"), my_data)
     model.set_alias({"Intercept": "a", "x": "b", "sigma": "s", "y": "response"})
-    idata = model.fit(tune=100, draws=100)
+    model.build()
+    assert {"a", "b", "s", "mu"}.issubset(model.backend.model.named_vars)
+
+    idata = non_distributional_fit[1].rename({"Intercept": "a", "x": "b", "sigma": "s"})
     model.predict(idata)
     assert list(idata.posterior.coords) == ["chain", "draw", "__obs__"]
     assert set(idata.posterior.data_vars) == {"a", "b", "mu", "s"}
     assert list(idata.posterior["mu"].coords) == ["chain", "draw", "__obs__"]
 
 
-def test_distributional_model(my_data):
-    formula = bmb.Formula("y ~ x", "sigma ~ x")
-    model = bmb.Model(formula, my_data)
-    idata = model.fit(tune=100, draws=100)
-    model.predict(idata)
+@pytest.mark.slow
+def test_distributional_model(my_data, distributional_fit):
+    model, idata = distributional_fit
+    idata = model.predict(idata, inplace=False)
 
     assert list(idata.posterior.coords) == ["chain", "draw", "__obs__"]
     assert set(idata.posterior.data_vars) == {
@@ -78,8 +104,14 @@ def test_distributional_model(my_data):
         "mu": {"Intercept": "mu_a", "x": "mu_b"},
         "sigma": {"Intercept": "sigma_a", "x": "sigma_b", "sigma": "s"},
     }
+    model = bmb.Model(bmb.Formula("y ~ x", "sigma ~ x"), my_data)
     model.set_alias(aliases)
-    idata = model.fit(tune=100, draws=100)
+    model.build()
+    assert {"mu_a", "mu_b", "sigma_a", "sigma_b", "s"}.issubset(model.backend.model.named_vars)
+
+    idata = distributional_fit[1].rename(
+        {"Intercept": "mu_a", "x": "mu_b", "sigma_Intercept": "sigma_a", "sigma_x": "sigma_b"}
+    )
     model.predict(idata)
 
     assert list(idata.posterior.coords) == ["chain", "draw", "__obs__"]
@@ -95,29 +127,36 @@ def test_distributional_model(my_data):
     assert list(idata.posterior["s"].coords) == ["chain", "draw", "__obs__"]
 
 
-def test_non_distributional_model_with_categories(anes):
-    model = bmb.Model("vote[clinton] ~ age + age:party_id", anes, family="bernoulli")
-    idata = model.fit(tune=100, draws=100)
-    model.predict(idata)
+@pytest.mark.slow
+def test_non_distributional_model_with_categories(anes, categories_fit, fast_fit):
+    model, idata = categories_fit
+    idata = model.predict(idata, inplace=False)
     assert list(idata.posterior.coords) == ["chain", "draw", "age:party_id_dim", "__obs__"]
     assert set(idata.posterior.data_vars) == {"Intercept", "age", "age:party_id", "p"}
     assert list(idata.posterior["p"].coords) == ["chain", "draw", "__obs__"]
     assert list(idata.posterior["age:party_id"].coords) == ["chain", "draw", "age:party_id_dim"]
     assert set(idata.posterior["age:party_id_dim"].values) == {"independent", "republican"}
 
+    # The aliased model is fitted, so the names come from the sampler and not from a rename
+    model = bmb.Model("vote[clinton] ~ age + age:party_id", anes, family="bernoulli")
     model.set_alias({"age": "β", "Intercept": "α", "age:party_id": "γ", "vote": "y"})
-    idata = model.fit(tune=100, draws=100)
-    model.predict(idata)
+    idata_aliased = model.fit(**fast_fit)
+    assert list(idata_aliased.posterior.coords) == ["chain", "draw", "γ_dim"]
+    assert set(idata_aliased.posterior.data_vars) == {"α", "β", "γ"}
+    assert list(idata_aliased.posterior["γ"].coords) == ["chain", "draw", "γ_dim"]
+    assert set(idata_aliased.posterior["γ_dim"].values) == {"independent", "republican"}
+
+    idata = model.predict(idata_aliased, inplace=False)
     assert list(idata.posterior.coords) == ["chain", "draw", "γ_dim", "__obs__"]
     assert set(idata.posterior.data_vars) == {"α", "β", "γ", "p"}
     assert list(idata.posterior["p"].coords) == ["chain", "draw", "__obs__"]
-    assert list(idata.posterior["γ"].coords) == ["chain", "draw", "γ_dim"]
-    assert set(idata.posterior["γ_dim"].values) == {"independent", "republican"}
 
     # Same as before, but also put an alias for 'p'
     model.set_alias({"age": "β", "Intercept": "α", "age:party_id": "γ", "vote": "y", "p": "mean"})
-    idata = model.fit(tune=100, draws=100)
-    model.predict(idata)
+    model.build()
+    assert {"α", "β", "γ", "mean"}.issubset(model.backend.model.named_vars)
+
+    idata = model.predict(idata_aliased, inplace=False)
     assert list(idata.posterior.coords) == ["chain", "draw", "γ_dim", "__obs__"]
     assert set(idata.posterior.data_vars) == {"α", "β", "γ", "mean"}
     assert list(idata.posterior["mean"].coords) == ["chain", "draw", "__obs__"]
@@ -125,11 +164,13 @@ def test_non_distributional_model_with_categories(anes):
     assert set(idata.posterior["γ_dim"].values) == {"independent", "republican"}
 
 
-def test_alias_equal_to_name(my_data):
+@pytest.mark.slow
+def test_alias_equal_to_name(my_data, fast_fit):
+    # An alias equal to the name is handled when the results of the sampler are renamed
     model = bmb.Model("y ~ 1 + x", my_data)
     model.set_alias({"sigma": "sigma"})
-    idata = model.fit(tune=100, draws=100)
-    set(idata.posterior.data_vars) == {"Intercept", "x", "sigma"}
+    idata = model.fit(**fast_fit)
+    assert set(idata.posterior.data_vars) == {"Intercept", "x", "sigma"}
 
 
 def test_set_alias_warnings(my_data):
@@ -51,6 +51,7 @@ def test_inference_method_names_and_kwargs():
         bmb.inference_methods.get_kwargs("not_a_method")
 
 
+@pytest.mark.slow
 def test_laplace():
     data = pd.DataFrame(np.repeat((0, 1), (30, 60)), columns=["w"])
     priors = {"Intercept": bmb.Prior("Uniform", lower=0, upper=1)}
@@ -63,6 +64,7 @@ def test_laplace():
     np.testing.assert_array_almost_equal((mode_n, std_n), (mode_a.item(), std_a.item()), decimal=2)
 
 
+@pytest.mark.slow
 def test_vi():
     data = pd.DataFrame(np.repeat((0, 1), (30, 60)), columns=["w"])
     priors = {"Intercept": bmb.Prior("Uniform", lower=0, upper=1)}
@@ -78,12 +80,14 @@ def test_vi():
     )
 
 
+@pytest.mark.slow
 @pytest.mark.parametrize("sampler", MCMC_METHODS_FILTERED)
 def test_logistic_regression_categoric_alternative_samplers(data_n100, sampler):
     model = bmb.Model("b1 ~ n1", data_n100, family="bernoulli")
     model.fit(inference_method=sampler)
 
 
+@pytest.mark.slow
 @pytest.mark.parametrize("sampler", MCMC_METHODS)
 def test_regression_alternative_samplers(data_n100, sampler):
     model = bmb.Model("n1 ~ n2", data_n100)
@@ -4,6 +4,9 @@ import pytest
 
 import bambi as bmb
 
+# All the tests fit a model
+pytestmark = pytest.mark.slow
+
 
 @pytest.fixture(scope="module")
 def data_gamma():
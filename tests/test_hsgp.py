@@ -36,6 +36,7 @@ def data_2d_multiple_groups():
     return pd.read_csv(DATA_DIR / "hsgp_2d_multiple_groups.csv")
 
 
+@pytest.mark.slow
 def test_minimal_1d_fits(data_1d_single_group):
     model = bmb.Model("y ~ 0 + hsgp(x, c=1.5, m=10)", data_1d_single_group)
     idata = model.fit(tune=500, draws=500, chains=2, random_seed=1234)
@@ -271,6 +272,7 @@ def test_bad_prior(data_1d_single_group):
         bmb.Model("y ~ 0 + hsgp(x, m=10, c=2)", data_1d_single_group, priors=priors)
 
 
+@pytest.mark.slow
 def test_minimal_1d_predicts(data_1d_single_group):
     model = bmb.Model("y ~ 0 + hsgp(x, c=1.5, m=10)", data_1d_single_group)
     idata = model.fit(tune=500, draws=500, chains=2, random_seed=1234)
@@ -302,6 +304,7 @@ def test_minimal_1d_predicts(data_1d_single_group):
     assert new_idata.posterior_predictive["y"].to_numpy().shape == (2, 500, 10)
 
 
+@pytest.mark.slow
 def test_multiple_hsgp_and_by(data_1d_multiple_groups):
     rng = np.random.default_rng(1234)
     df = data_1d_multiple_groups.copy()
@@ -3,13 +3,14 @@ This module contains tests for the helper functions of the 'interpret' sub-packa
 Tests here do not test any of the plotting functionality.
 """
 
+import arviz as az
 import numpy as np
 import pandas as pd
 import pytest
 
 import bambi as bmb
 from bambi.interpret.helpers import data_grid, select_draws
-from bambi.interpret.utils import get_model_covariates
+from bambi.interpret.utils import average_over, enforce_dtypes, get_model_covariates, hdi
 
 
 CHAINS = 4
@@ -38,6 +39,7 @@ def mtcars():
 # -------------------------------------------------------------------
 
 
+@pytest.mark.slow
 @pytest.mark.parametrize(
     "conditional",
     [
@@ -66,6 +68,7 @@ def test_data_grid_no_effect(request, mtcars, conditional):
         assert grid.columns.tolist() == ["hp", "drat", "am"]
 
 
+@pytest.mark.slow
 def test_data_grid_no_effect_kwargs(request, mtcars):
     model, idata = mtcars
     grid = data_grid(model, ["hp", "drat"], num=10)
@@ -74,6 +77,7 @@ def test_data_grid_no_effect_kwargs(request, mtcars):
     assert grid.columns.tolist() == ["hp", "drat", "am"]
 
 
+@pytest.mark.slow
 @pytest.mark.parametrize(
     "conditional, variable",
     [
@@ -106,6 +110,7 @@ def test_data_grid_comparisons(request, mtcars, conditional, variable):
         data_grid(model, conditional, variable=variable, effect_type=None)
 
 
+@pytest.mark.slow
 @pytest.mark.parametrize(
     "conditional, variable",
     [
@@ -138,6 +143,7 @@ def test_data_grid_slopes(request, mtcars, conditional, variable):
         data_grid(model, conditional, variable=variable, effect_type=None)
 
 
+@pytest.mark.slow
 @pytest.mark.parametrize(
     "effect_type, eps", [("comparisons", 1), ("slopes", 1e-2)], ids=["comparisons", "slopes"]
 )
@@ -166,6 +172,7 @@ def test_data_grid_eps(request, mtcars, effect_type, eps):
 # -------------------------------------------------------------------
 
 
+@pytest.mark.slow
 @pytest.mark.parametrize(
     "condition",
     [
@@ -207,3 +214,71 @@ def test_get_model_covariates():
     formula = "y ~ 1 + bs(x, degree=3, knots=knots)"
     model = bmb.Model(formula, df)
     assert set(get_model_covariates(model)) == {"x"}
+
+
+@pytest.mark.parametrize("shape", [(2, 100, 5), (4, 50, 3, 2)])
+def test_hdi(shape):
+    """Tests `hdi()` matches `az.hdi()` element by element"""
+    draws = np.random.default_rng(1234).normal(size=shape)
+    bounds = hdi(draws, 0.89)
+    assert bounds.shape == (2,) + shape[2:]
+    assert np.array_equal(np.moveaxis(bounds, 0, -1), az.hdi(draws, 0.89))
+
+
+def test_average_over_categorical():
+    """Tests `average_over()` only returns the observed levels of a categorical covariate"""
+    data = pd.DataFrame(
+        {
+            "g": pd.Categorical(["a", "a", "c"], categories=["a", "b", "c"]),
+            "estimate": [1.0, 2.0, 3.0],
+            "lower": [0.0, 1.0, 2.0],
+            "upper": [2.0, 3.0, 4.0],
+        }
+    )
+    summary = average_over(data, "g")
+    assert summary["g"].tolist() == ["a", "c"]
+    assert summary["estimate"].tolist() == [1.5, 3.0]
+
+
+def test_enforce_dtypes_except_col():
+    """Tests `enforce_dtypes()` casts all the columns but `except_col`"""
+    observed = pd.DataFrame({"g": pd.Categorical(["a", "b"]), "x": [1, 2], "y": [1, 2]})
+    new = pd.DataFrame({"g": ["a", "b"], "x": [1.0, 2.0], "y": [1.0, 2.0]})
+    result = enforce_dtypes(observed, new, except_col="y")
+    assert isinstance(result["g"].dtype, pd.CategoricalDtype)
+    assert result["x"].dtype == np.int64
+    assert result["y"].dtype == np.float64
+
+
+@pytest.mark.slow
+@pytest.mark.parametrize("use_hdi", [True, False])
+def test_predictions_response_levels(use_hdi):
+    """Tests `predictions()` summarizes each level of a categorical response"""
+    rng = np.random.default_rng(1234)
+    df = pd.DataFrame({"x": rng.normal(size=50), "y": rng.choice(["a", "b", "c"], size=50)})
+    model = bmb.Model("y ~ x", df, family="categorical")
+    idata = model.fit(tune=100, draws=100, chains=2, random_seed=1234)
+    summary = bmb.interpret.predictions(model, idata, "x", use_hdi=use_hdi)
+
+    assert summary.shape == (150, 5)
+    assert summary["estimate_dim"].tolist() == ["a", "b", "c"] * 50
+    assert np.all(summary["lower_3.0%"] <= summary["estimate"])
+    assert np.all(summary["estimate"] <= summary["upper_97.0%"])
+
+
+@pytest.mark.slow
+def test_comparisons_unit_level_repeated_rows():
+    """Tests unit level `comparisons()` keeps observations with the same covariate values"""
+    rng = np.random.default_rng(1234)
+    df = pd.DataFrame(
+        {
+            "x": np.repeat([0.0, 1.0], 15),
+            "h": np.tile(["u", "v"], 15),
+            "y": rng.choice(["a", "b", "c"], size=30),
+        }
+    )
+    model = bmb.Model("y ~ x + h", df, family="categorical")
+    idata = model.fit(tune=100, draws=100, chains=2, random_seed=1234)
+    summary = bmb.interpret.comparisons(model, idata, "h", None)
+    # one row per observation and response level
+    assert summary.shape[0] == len(df) * 3
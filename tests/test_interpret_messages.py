@@ -4,14 +4,17 @@ import pytest
 
 from bambi.interpret import plot_comparisons, plot_predictions, plot_slopes
 
+# All the tests use the fitted 'mtcars' model
+pytestmark = pytest.mark.slow
+
 
 @pytest.fixture(scope="module")
-def mtcars():
+def mtcars(fast_fit):
     "Model with common level effects only"
     data = bmb.load_data("mtcars")
     data["am"] = pd.Categorical(data["am"], categories=[0, 1], ordered=True)
     model = bmb.Model("mpg ~ hp * drat * am", data)
-    idata = model.fit(tune=500, draws=500, random_seed=1234)
+    idata = model.fit(random_seed=1234, **fast_fit)
     return model, idata
 
 
@@ -1,7 +1,4 @@
 import logging
-
-from functools import reduce
-from operator import add
 from os.path import dirname, join
 
 import arviz as az
@@ -29,37 +26,13 @@ def data_numeric_xy():
 
 
 @pytest.fixture(scope="module")
-def diabetes_data():
-    data_dir = join(dirname(__file__), "data")
-    data = pd.read_csv(join(data_dir, "diabetes.txt"), sep="\t")
-    data["age_grp"] = 0
-    data.loc[data["AGE"] > 40, "age_grp"] = 1
-    data.loc[data["AGE"] > 60, "age_grp"] = 2
-    return data
-
-
-@pytest.fixture(scope="module")
-def crossed_data():
+def interaction_model(crossed_data):
     """
-    Group specific effects:
-    10 subjects, 12 items, 5 sites
-    Subjects crossed with items, nested in sites
-    Items crossed with sites
-
-    Common effects:
-    A continuous predictor, a numeric dummy, and a three-level category
-    (levels a,b,c)
-
-    Structure:
-    Subjects nested in dummy (e.g., gender), crossed with threecats
-    Items crossed with dummy, nested in threecats
-    Sites partially crossed with dummy (4/5 see a single dummy, 1/5 sees both
-    dummies)
-    Sites crossed with threecats
+    Model with an interaction between two categorical predictors. It's shared by the tests
+    that only inspect its terms, so it must not be modified.
     """
-    data_dir = join(dirname(__file__), "data")
-    data = pd.read_csv(join(data_dir, "crossed_random.csv"))
-    return data
+    data = crossed_data.assign(fourcats=np.repeat(["a", "b", "c", "d"], 10).tolist() * 3)
+    return bmb.Model("Y ~ threecats*fourcats", data)
 
 
 @pytest.fixture(scope="module")
@@ -151,9 +124,8 @@ def test_model_term_names_property(diabetes_data):
     assert set(parent_component.common_terms) == {"age_grp", "BP", "S1"}
 
 
-def test_model_term_names_property_interaction(crossed_data):
-    crossed_data["fourcats"] = sum([[x] * 10 for x in ["a", "b", "c", "d"]], list()) * 3
-    model = bmb.Model("Y ~ threecats*fourcats", crossed_data)
+def test_model_term_names_property_interaction(interaction_model):
+    model = interaction_model
     parent_component = model.components[model.family.likelihood.parent]
     assert parent_component.intercept_term.name == "Intercept"
     assert set(parent_component.common_terms) == {
@@ -163,10 +135,8 @@ def test_model_term_names_property_interaction(crossed_data):
     }
 
 
-def test_model_terms_levels_interaction(crossed_data):
-    crossed_data["fourcats"] = sum([[x] * 10 for x in ["a", "b", "c", "d"]], list()) * 3
-    model = bmb.Model("Y ~ threecats*fourcats", crossed_data)
-
+def test_model_terms_levels_interaction(interaction_model):
+    model = interaction_model
     assert model.components[model.family.likelihood.parent].terms["threecats:fourcats"].levels == [
         "b, b",
         "b, c",
@@ -183,9 +153,9 @@ def test_model_terms_levels():
         {
             "y": rng.normal(size=50),
             "x": rng.normal(size=50),
-            "z": reduce(add, [[f"Group {x}"] * 10 for x in ["1", "2", "3", "1", "2"]]),
+            "z": np.repeat([f"Group {x}" for x in ["1", "2", "3", "1", "2"]], 10).tolist(),
             "time": list(range(1, 11)) * 5,
-            "subject": reduce(add, [[f"Subject {x}"] * 10 for x in range(1, 6)]),
+            "subject": np.repeat([f"Subject {x}" for x in range(1, 6)], 10).tolist(),
         }
     )
     model = bmb.Model("y ~ x + z + time + (time|subject)", data)
@@ -199,7 +169,8 @@ def test_model_terms_levels():
     ]
 
 
-def test_model_term_classes():
+@pytest.fixture(scope="module")
+def term_classes_model():
     rng = np.random.default_rng(121195)
     data = pd.DataFrame(
         {
@@ -209,28 +180,36 @@ def test_model_term_classes():
             "g": rng.choice(["a", "b", "c"], size=50),
         }
     )
+    return bmb.Model("y ~ x*g + (x|s)", data)
 
-    model = bmb.Model("y ~ x*g + (x|s)", data)
-
-    parent_component = model.components[model.family.likelihood.parent]
-    assert isinstance(parent_component.terms["x"], CommonTerm)
-    assert isinstance(parent_component.terms["g"], CommonTerm)
-    assert isinstance(parent_component.terms["x:g"], CommonTerm)
-    assert isinstance(parent_component.terms["1|s"], GroupSpecificTerm)
-    assert isinstance(parent_component.terms["x|s"], GroupSpecificTerm)
 
+@pytest.mark.parametrize(
+    "name, term_class, categorical",
+    [
+        ("x", CommonTerm, False),
+        ("g", CommonTerm, True),
+        ("x:g", CommonTerm, True),
+        ("1|s", GroupSpecificTerm, False),
+        ("x|s", GroupSpecificTerm, False),
+    ],
+)
+def test_model_term_classes(term_classes_model, name, term_class, categorical):
+    model = term_classes_model
+    term = model.components[model.family.likelihood.parent].terms[name]
+    assert isinstance(term, term_class)
     # Also check 'categorical' attribute is right
-    assert parent_component.terms["g"].categorical
+    assert term.categorical is categorical
 
 
 def test_one_shot_formula_fit(diabetes_data):
     model = bmb.Model("S3 ~ S1 + S2", diabetes_data)
-    model.fit(tune=100, draws=100)
+    model.build()
     named_vars = model.backend.model.named_vars
     targets = ["S3", "S1", "Intercept"]
     assert len(set(named_vars.keys()) & set(targets)) == 3
 
 
+@pytest.mark.slow
 def test_categorical_term():
     rng = np.random.default_rng(121195)
     data = pd.DataFrame(
@@ -267,7 +246,8 @@ def test_categorical_term():
     assert set(df.index) == names
 
 
-def test_omit_offsets_false():
+@pytest.fixture(scope="module")
+def data_groups():
     rng = np.random.default_rng(121195)
     data = pd.DataFrame(
         {
@@ -276,45 +256,34 @@ def test_omit_offsets_false():
             "g1": ["a"] * 50 + ["b"] * 50,
         }
     )
-    model = bmb.Model("y ~ x1 + (x1|g1)", data)
-    fitted = model.fit(tune=100, draws=100, omit_offsets=False)
-    offsets = [var for var in fitted.posterior.var() if var.endswith("_offset")]
-    assert offsets == ["1|g1_offset", "x1|g1_offset"]
+    return data
 
 
-def test_omit_offsets_true():
-    rng = np.random.default_rng(121195)
-    data = pd.DataFrame(
-        {
-            "y": rng.normal(size=100),
-            "x1": rng.normal(size=100),
-            "g1": ["a"] * 50 + ["b"] * 50,
-        }
-    )
-    model = bmb.Model("y ~ x1 + (x1|g1)", data)
-    fitted = model.fit(tune=100, draws=100, omit_offsets=True)
+@pytest.fixture(scope="module")
+def offset_model(data_groups):
+    return bmb.Model("y ~ x1 + (x1|g1)", data_groups)
+
+
+@pytest.mark.slow
+@pytest.mark.parametrize(
+    "omit_offsets, expected", [(False, ["1|g1_offset", "x1|g1_offset"]), (True, [])]
+)
+def test_omit_offsets(offset_model, fast_fit, omit_offsets, expected):
+    fitted = offset_model.fit(omit_offsets=omit_offsets, **fast_fit)
     offsets = [var for var in fitted.posterior.var() if var.endswith("_offset")]
-    assert not offsets
+    assert offsets == expected
 
 
-def test_hyperprior_on_common_effect():
-    rng = np.random.default_rng(121195)
-    data = pd.DataFrame(
-        {
-            "y": rng.normal(size=100),
-            "x1": rng.normal(size=100),
-            "g1": ["a"] * 50 + ["b"] * 50,
-        }
-    )
+def test_hyperprior_on_common_effect(data_groups):
     slope = bmb.Prior("Normal", mu=0, sd=bmb.Prior("HalfCauchy", beta=2))
 
     priors = {"x1": slope}
     with pytest.raises(ValueError):
-        bmb.Model("y ~ x1 + (x1|g1)", data, priors=priors)
+        bmb.Model("y ~ x1 + (x1|g1)", data_groups, priors=priors)
 
     priors = {"common": slope}
     with pytest.raises(ValueError):
-        bmb.Model("y ~ x1 + (x1|g1)", data, priors=priors)
+        bmb.Model("y ~ x1 + (x1|g1)", data_groups, priors=priors)
 
 
 @pytest.mark.parametrize(
@@ -336,37 +305,33 @@ def test_automatic_priors(family):
     bmb.Model("x ~ 0", obs, family=family)
 
 
-def test_links():
-    rng = np.random.default_rng(121195)
-    data = pd.DataFrame(
-        {
-            "g": rng.choice([0, 1], size=100),
-            "y": rng.integers(3, 10, size=100),
-            "x": rng.integers(3, 10, size=100),
-        }
-    )
-
-    FAMILIES = {
-        "asymmetriclaplace": ["identity", "log", "inverse"],
-        "bernoulli": ["identity", "logit", "probit", "cloglog"],
-        "beta": ["logit", "probit", "cloglog"],
-        "gamma": ["identity", "inverse", "log"],
-        "gaussian": ["identity", "log", "inverse"],
-        "negativebinomial": ["identity", "log", "cloglog"],
-        "poisson": ["identity", "log"],
-        "vonmises": ["identity", "tan_2"],
-        "wald": ["inverse", "inverse_squared", "identity", "log"],
-    }
-    for family, links in FAMILIES.items():
-        for link in links:
-            if family == "bernoulli":
-                bmb.Model("g ~ x", data, family=family, link=link)
-            else:
-                bmb.Model("y ~ x", data, family=family, link=link)
+LINKS = {
+    "asymmetriclaplace": ["identity", "log", "inverse"],
+    "bernoulli": ["identity", "logit", "probit", "cloglog"],
+    "beta": ["logit", "probit", "cloglog"],
+    "gamma": ["identity", "inverse", "log"],
+    "gaussian": ["identity", "log", "inverse"],
+    "negativebinomial": ["identity", "log", "cloglog"],
+    "poisson": ["identity", "log"],
+    "vonmises": ["identity", "tan_2"],
+    "wald": ["inverse", "inverse_squared", "identity", "log"],
+}
+
+# Names of links that are not suitable for the family
+BAD_LINKS = {
+    "bernoulli": ["inverse", "inverse_squared", "log"],
+    "beta": ["inverse", "inverse_squared", "log"],
+    "gamma": ["logit", "probit", "cloglog"],
+    "gaussian": ["logit", "probit", "cloglog"],
+    "negativebinomial": ["logit", "probit", "inverse", "inverse_squared"],
+    "poisson": ["logit", "probit", "cloglog", "inverse", "inverse_squared"],
+    "vonmises": ["logit", "probit", "cloglog"],
+    "wald": ["logit", "probit", "cloglog"],
+}
 
 
-def test_bad_links():
-    """Passes names of links that are not suitable for the family."""
+@pytest.fixture(scope="module")
+def data_links():
     rng = np.random.default_rng(121195)
     data = pd.DataFrame(
         {
@@ -375,25 +340,21 @@ def test_bad_links():
             "x": rng.integers(3, 10, size=100),
         }
     )
-    FAMILIES = {
-        "bernoulli": ["inverse", "inverse_squared", "log"],
-        "beta": ["inverse", "inverse_squared", "log"],
-        "gamma": ["logit", "probit", "cloglog"],
-        "gaussian": ["logit", "probit", "cloglog"],
-        "negativebinomial": ["logit", "probit", "inverse", "inverse_squared"],
-        "poisson": ["logit", "probit", "cloglog", "inverse", "inverse_squared"],
-        "vonmises": ["logit", "probit", "cloglog"],
-        "wald": ["logit", "probit", "cloglog"],
-    }
+    return data
 
-    for family, links in FAMILIES.items():
-        for link in links:
-            with pytest.raises(ValueError):
-                if family == "bernoulli":
-                    formula = "g ~ x"
-                else:
-                    formula = "y ~ x"
-                bmb.Model(formula, data, family=family, link=link)
+
+@pytest.mark.parametrize(
+    "family, link, valid",
+    [(family, link, True) for family, links in LINKS.items() for link in links]
+    + [(family, link, False) for family, links in BAD_LINKS.items() for link in links],
+)
+def test_links(data_links, family, link, valid):
+    formula = "g ~ x" if family == "bernoulli" else "y ~ x"
+    if valid:
+        bmb.Model(formula, data_links, family=family, link=link)
+    else:
+        with pytest.raises(ValueError):
+            bmb.Model(formula, data_links, family=family, link=link)
 
 
 def test_constant_terms():
@@ -461,6 +422,7 @@ def test_response_is_truncated():
     assert dm.response_component.term.is_truncated is True
 
 
+@pytest.mark.slow
 def test_custom_likelihood_function():
     df = pd.DataFrame({"y": [1, 2, 3, 4, 5], "x": [1, 1, 2, 2, 3]})
 
@@ -553,6 +515,7 @@ def test_init_fallback(init_data, caplog):
         assert "Initializing NUTS using adapt_diag..." in caplog.text
 
 
+@pytest.mark.slow
 def test_2d_response_no_shape():
     """
     This tests whether a model where there's a single linear predictor and a response with
@@ -9,37 +9,26 @@ import numpy as np
 import pandas as pd
 import pymc as pm
 
+from scipy import sparse
+
 from bambi.terms import GroupSpecificTerm
 
+# All the tests fit a model
+pytestmark = pytest.mark.slow
+
 TUNE = 50
 DRAWS = 50
 
 
 @pytest.fixture(scope="module")
-def crossed_data():
+def crossed_data_fourcats(crossed_data):
     """
-    Group specific effects:
-    10 subjects, 12 items, 5 sites
-    Subjects crossed with items, nested in sites
-    Items crossed with sites
-
-    common effects:
-    A continuous predictor, a numeric dummy, and a three-level category
-    (levels a,b,c)
-
-    Structure:
-    Subjects nested in dummy (e.g., gender), crossed with threecats
-    Items crossed with dummy, nested in threecats
-    Sites partially crossed with dummy (4/5 see a single dummy, 1/5 sees both
-    dummies)
-    Sites crossed with threecats
+    The crossed data with the subjects as strings and a four-level category (levels a,b,c,d)
     """
-
-    data_dir = join(dirname(__file__), "data")
-    data = pd.read_csv(join(data_dir, "crossed_random.csv"))
-    data["subj"] = data["subj"].astype(str)
-    data["fourcats"] = sum([[x] * 10 for x in ["a", "b", "c", "d"]], list()) * 3
-    return data
+    return crossed_data.assign(
+        subj=crossed_data["subj"].astype(str),
+        fourcats=np.repeat(["a", "b", "c", "d"], 10).tolist() * 3,
+    )
 
 
 @pytest.fixture(scope="module")
@@ -173,24 +162,24 @@ class FitPredictParent:
 
 
 class TestGaussian(FitPredictParent):
-    def test_intercept_only_model(self, crossed_data):
-        model = bmb.Model("Y ~ 1", crossed_data)
+    def test_intercept_only_model(self, crossed_data_fourcats):
+        model = bmb.Model("Y ~ 1", crossed_data_fourcats)
         idata = self.fit(model)
         self.predict_oos(model, idata)
 
-    def test_slope_only_model(self, crossed_data):
-        model = bmb.Model("Y ~ 0 + continuous", crossed_data)
+    def test_slope_only_model(self, crossed_data_fourcats):
+        model = bmb.Model("Y ~ 0 + continuous", crossed_data_fourcats)
         idata = self.fit(model)
         self.predict_oos(model, idata)
 
-    def test_cell_means_parameterization(self, crossed_data):
-        model = bmb.Model("Y ~ 0 + threecats", crossed_data)
+    def test_cell_means_parameterization(self, crossed_data_fourcats):
+        model = bmb.Model("Y ~ 0 + threecats", crossed_data_fourcats)
         idata = self.fit(model)
         assert list(idata.posterior["threecats_dim"]) == ["a", "b", "c"]
         self.predict_oos(model, idata)
 
-    def test_2_factors_saturated(self, crossed_data):
-        model = bmb.Model("Y ~ threecats*fourcats", crossed_data)
+    def test_2_factors_saturated(self, crossed_data_fourcats):
+        model = bmb.Model("Y ~ threecats*fourcats", crossed_data_fourcats)
         idata = self.fit(model)
         assert set(idata.posterior.data_vars) == {
             "Intercept",
@@ -211,8 +200,8 @@ class TestGaussian(FitPredictParent):
         ]
         self.predict_oos(model, idata)
 
-    def test_2_factors_no_intercept(self, crossed_data):
-        model = bmb.Model("Y ~ 0 + threecats*fourcats", crossed_data)
+    def test_2_factors_no_intercept(self, crossed_data_fourcats):
+        model = bmb.Model("Y ~ 0 + threecats*fourcats", crossed_data_fourcats)
         idata = self.fit(model)
         assert set(idata.posterior.data_vars) == {
             "threecats",
@@ -232,8 +221,8 @@ class TestGaussian(FitPredictParent):
         ]
         self.predict_oos(model, idata)
 
-    def test_2_factors_cell_means(self, crossed_data):
-        model = bmb.Model("Y ~ 0 + threecats:fourcats", crossed_data)
+    def test_2_factors_cell_means(self, crossed_data_fourcats):
+        model = bmb.Model("Y ~ 0 + threecats:fourcats", crossed_data_fourcats)
         idata = self.fit(model)
         assert set(idata.posterior.data_vars) == {"threecats:fourcats", "sigma"}
         assert list(idata.posterior["threecats:fourcats_dim"].values) == [
@@ -252,14 +241,14 @@ class TestGaussian(FitPredictParent):
         ]
         self.predict_oos(model, idata)
 
-    def test_cell_means_with_covariate(self, crossed_data):
-        model = bmb.Model("Y ~ 0 + threecats + continuous", crossed_data)
+    def test_cell_means_with_covariate(self, crossed_data_fourcats):
+        model = bmb.Model("Y ~ 0 + threecats + continuous", crossed_data_fourcats)
         idata = self.fit(model)
         assert set(idata.posterior.data_vars) == {"threecats", "continuous", "sigma"}
         assert list(idata.posterior["threecats_dim"].values) == ["a", "b", "c"]
         self.predict_oos(model, idata)
 
-    def test_many_common_many_group_specific(self, crossed_data):
+    def test_many_common_many_group_specific(self, crossed_data_fourcats):
         # Comparing implicit/explicit intercepts for group specific effects work the same way.
         terms0 = [
             "continuous",
@@ -281,11 +270,11 @@ class TestGaussian(FitPredictParent):
             "(threecats|site)",
         ]
 
-        model0 = bmb.Model("Y ~ " + " + ".join(terms0), crossed_data)
+        model0 = bmb.Model("Y ~ " + " + ".join(terms0), crossed_data_fourcats)
         idata0 = self.fit(model0)
         self.predict_oos(model0, idata0)
 
-        model1 = bmb.Model("Y ~ " + " + ".join(terms1), crossed_data)
+        model1 = bmb.Model("Y ~ " + " + ".join(terms1), crossed_data_fourcats)
         idata1 = self.fit(model1)
         self.predict_oos(model1, idata1)
 
@@ -302,8 +291,8 @@ class TestGaussian(FitPredictParent):
 
         # check that the group specific effect design matrix contain the same columns,
         # even if term names / columns names / order of columns is different
-        X0_set = set(tuple(X0.iloc[:, i]) for i in range(len(X0.columns)))
-        X1_set = set(tuple(X1.iloc[:, i]) for i in range(len(X1.columns)))
+        X0_set = set(map(tuple, X0.to_numpy().T))
+        X1_set = set(map(tuple, X1.to_numpy().T))
         assert X0_set == X1_set
 
         # check that common effect design matrices are the same,
@@ -346,7 +335,7 @@ class TestGaussian(FitPredictParent):
             if set(a) != set(b):
                 return False
             else:
-                return [np.allclose(a[x], b[x], atol=0, rtol=0.01) for x in a.keys()]
+                return all(np.allclose(a[x], b[x], atol=0, rtol=0.01) for x in a.keys())
 
         assert all([dicts_close(priors0[x], priors1[x]) for x in priors0.keys()])
 
@@ -368,11 +357,11 @@ class TestGaussian(FitPredictParent):
             if set(a) != set(b):
                 return False
             else:
-                return [np.allclose(a[x], b[x], atol=0, rtol=0.01) for x in a.keys()]
+                return all(np.allclose(a[x], b[x], atol=0, rtol=0.01) for x in a.keys())
 
         assert all([dicts_close(priors0[x], priors1[x]) for x in priors0.keys()])
 
-    def test_cell_means_with_many_group_specific_effects(self, crossed_data):
+    def test_cell_means_with_many_group_specific_effects(self, crossed_data_fourcats):
         # Group specific intercepts are added in different way, but the final result should be the same.
         terms0 = [
             "0",
@@ -393,11 +382,11 @@ class TestGaussian(FitPredictParent):
             "(dummy|item)",
             "(threecats|site)",
         ]
-        model0 = bmb.Model("Y ~ " + " + ".join(terms0), crossed_data)
+        model0 = bmb.Model("Y ~ " + " + ".join(terms0), crossed_data_fourcats)
         idata0 = self.fit(model0)
         self.predict_oos(model0, idata0)
 
-        model1 = bmb.Model("Y ~ " + " + ".join(terms1), crossed_data)
+        model1 = bmb.Model("Y ~ " + " + ".join(terms1), crossed_data_fourcats)
         idata1 = self.fit(model1)
         self.predict_oos(model1, idata1)
 
@@ -424,8 +413,8 @@ class TestGaussian(FitPredictParent):
 
         # check that the group specific effect design matrix contain the same columns,
         # even if term names / columns names / order of columns is different
-        X0_set = set(tuple(X0.iloc[:, i]) for i in range(len(X0.columns)))
-        X1_set = set(tuple(X1.iloc[:, i]) for i in range(len(X1.columns)))
+        X0_set = set(map(tuple, X0.to_numpy().T))
+        X1_set = set(map(tuple, X1.to_numpy().T))
         assert X0_set == X1_set
 
         # check that common effect design matrices are the same,
@@ -472,8 +461,8 @@ class TestGaussian(FitPredictParent):
         }
         assert set(priors0) == set(priors1)
 
-    def test_group_specific_categorical_interaction(self, crossed_data):
-        model = bmb.Model("Y ~ continuous + (threecats:fourcats|site)", crossed_data)
+    def test_group_specific_categorical_interaction(self, crossed_data_fourcats):
+        model = bmb.Model("Y ~ continuous + (threecats:fourcats|site)", crossed_data_fourcats)
         idata = self.fit(model)
         self.predict_oos(model, idata)
 
@@ -510,9 +499,9 @@ class TestGaussian(FitPredictParent):
         ]
         assert list(idata.posterior["site__factor_dim"].values) == ["0", "1", "2", "3", "4"]
 
-    def test_fit_include_mean(self, crossed_data):
+    def test_fit_include_mean(self, crossed_data_fourcats):
         draws = 100
-        model = bmb.Model("Y ~ continuous * threecats", crossed_data)
+        model = bmb.Model("Y ~ continuous * threecats", crossed_data_fourcats)
         idata = model.fit(tune=draws, draws=draws, include_response_params=True)
         assert idata.posterior["mu"].shape[1:] == (draws, 120)
 
@@ -669,15 +658,16 @@ class TestPoisson(FitPredictParent):
         y_mean_posterior = idata.posterior[y_mean_name].to_numpy()
         assert (y_mean_posterior > 0).all()
 
-    def test_poisson_regression(self, crossed_data):
-        crossed_data["count"] = (crossed_data["Y"] - crossed_data["Y"].min()).round()
-        model0 = bmb.Model("count ~ dummy + continuous + threecats", crossed_data, family="poisson")
+    def test_poisson_regression(self, crossed_data_fourcats):
+        data = crossed_data_fourcats
+        data = data.assign(count=(data["Y"] - data["Y"].min()).round())
+        model0 = bmb.Model("count ~ dummy + continuous + threecats", data, family="poisson")
         idata0 = self.fit(model0)
         idata0 = self.predict_oos(model0, idata0)
         self.assert_mean_range(model0, idata0)
 
         # build model using add
-        model1 = bmb.Model("count ~ threecats + continuous + dummy", crossed_data, family="poisson")
+        model1 = bmb.Model("count ~ threecats + continuous + dummy", data, family="poisson")
         idata1 = self.fit(model1)
         idata1 = self.predict_oos(model1, idata1)
         self.assert_mean_range(model1, idata1)
@@ -724,7 +714,7 @@ class TestPoisson(FitPredictParent):
             if set(a) != set(b):
                 return False
             else:
-                return [np.allclose(a[x], b[x], atol=0, rtol=0.01) for x in a.keys()]
+                return all(np.allclose(a[x], b[x], atol=0, rtol=0.01) for x in a.keys())
 
         assert all([dicts_close(priors0[x], priors1[x]) for x in priors0.keys()])
 
@@ -896,6 +886,8 @@ class TestCategorical(FitPredictParent):
         y_name = model.response_component.term.name
         y_posterior_predictive = idata.posterior_predictive[y_name].to_numpy()
         assert set(np.unique(y_posterior_predictive)).issubset(set(range(n)))
+        # The draws use the default integer type, regardless of the number of levels
+        assert y_posterior_predictive.dtype == np.int64
 
     def test_basic(self, inhaler_data):
         model = bmb.Model("rating ~ period + carry + treat", inhaler_data, family="categorical")
@@ -1340,6 +1332,82 @@ def test_predict_offset():
     model.predict(idata, kind="response")
 
 
+def test_predict_multiple_offsets():
+    # Offsets that are not next to each other in the design matrix
+    rng = np.random.default_rng(121195)
+    data = pd.DataFrame(
+        {
+            "y": rng.normal(size=50),
+            "x": rng.normal(size=50),
+            "t": rng.uniform(1, 2, size=50),
+            "s": rng.uniform(5, 6, size=50),
+        }
+    )
+    model = bmb.Model("y ~ offset(t) + x + offset(s)", data)
+    idata = model.fit(tune=DRAWS, draws=DRAWS, random_seed=1234)
+    model.predict(idata)
+
+    posterior = idata.posterior
+    expected = (
+        posterior["Intercept"].to_numpy()[..., np.newaxis]
+        + posterior["x"].to_numpy()[..., np.newaxis] * data["x"].to_numpy()
+        + data["t"].to_numpy()
+        + data["s"].to_numpy()
+    )
+    assert np.allclose(posterior["mu"].to_numpy(), expected)
+
+
+def test_predict_keeps_float32():
+    rng = np.random.default_rng(121195)
+    data = pd.DataFrame(
+        {
+            "y": rng.normal(size=50),
+            "x": rng.normal(size=50),
+            "group": np.tile(np.arange(5), 10),
+        }
+    )
+    model = bmb.Model("y ~ 1 + x + (1 | group)", data)
+    idata = model.fit(tune=DRAWS, draws=DRAWS, random_seed=1234)
+    idata_64 = model.predict(idata, inplace=False)
+
+    idata.posterior = idata.posterior.astype("float32")
+    idata_32 = model.predict(idata, inplace=False)
+    assert idata_32.posterior["mu"].dtype == np.float32
+    assert np.allclose(idata_32.posterior["mu"], idata_64.posterior["mu"], rtol=1e-4)
+
+
+def test_predict_many_groups():
+    # The group-specific design matrix is sparse enough to use a sparse product
+    rng = np.random.default_rng(121195)
+    data = pd.DataFrame(
+        {
+            "y": rng.normal(size=100),
+            "x": rng.normal(size=100),
+            "group": np.tile(np.arange(20), 5),
+        }
+    )
+    model = bmb.Model("y ~ 1 + x + (1 + x | group)", data)
+    idata = model.fit(tune=DRAWS, draws=DRAWS, random_seed=1234)
+    model.predict(idata)
+
+    posterior = idata.posterior
+    group = data["group"].to_numpy()
+    x = data["x"].to_numpy()
+    expected = (
+        posterior["Intercept"].to_numpy()[..., np.newaxis]
+        + posterior["x"].to_numpy()[..., np.newaxis] * x
+        + posterior["1|group"].to_numpy()[..., group]
+        + posterior["x|group"].to_numpy()[..., group] * x
+    )
+    assert np.allclose(posterior["mu"].to_numpy(), expected)
+
+    # The sparse design matrix is stored, so it's not converted again in later predictions
+    Z = model.components["mu"]._group_design_matrix
+    assert sparse.issparse(Z)
+    model.predict(idata)
+    assert model.components["mu"]._group_design_matrix is Z
+
+
 def test_predict_new_groups_fail(sleepstudy):
     model = bmb.Model("Reaction ~ 1 + Days + (1 + Days | Subject)", sleepstudy)
     idata = model.fit(tune=20, draws=20)
@@ -1375,7 +1443,7 @@ def test_predict_new_groups_fail(sleepstudy):
             ),
         ),
         (
-            "crossed_data",
+            "crossed_data_fourcats",
             "Y ~ 0 + threecats + (0 + threecats | subj)",
             "gaussian",
             pd.DataFrame({"threecats": ["a", "a"], "subj": ["0", "11"]}),
@@ -8,6 +8,9 @@ import pytest
 import bambi as bmb
 from bambi.interpret import plot_comparisons, plot_predictions, plot_slopes
 
+# All the tests use fitted models
+pytestmark = pytest.mark.slow
+
 
 @pytest.fixture(scope="module")
 def mtcars():
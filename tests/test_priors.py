@@ -1,4 +1,3 @@
-from os.path import dirname, join
 import pytest
 
 import numpy as np
@@ -9,16 +8,6 @@ from scipy import special
 import bambi as bmb
 
 
-@pytest.fixture(scope="module")
-def diabetes_data():
-    data_dir = join(dirname(__file__), "data")
-    data = pd.read_csv(join(data_dir, "diabetes.txt"), sep="\t")
-    data["age_grp"] = 0
-    data.loc[data["AGE"] > 40, "age_grp"] = 1
-    data.loc[data["AGE"] > 60, "age_grp"] = 2
-    return data
-
-
 def test_prior_class():
     prior = bmb.Prior("CheeseWhiz", holes=0, taste=-10)
     assert prior.name == "CheeseWhiz"
@@ -140,6 +129,13 @@ def test_prior_eq():
     assert prior1 != prior2
     assert prior1 != "bmb.Prior"
 
+    # Priors with array arguments
+    prior3 = bmb.Prior("Normal", mu=np.zeros(3), sigma=np.ones(3))
+    assert prior3 == bmb.Prior("Normal", mu=np.zeros(3), sigma=np.ones(3))
+    assert prior3 != bmb.Prior("Normal", mu=np.zeros(3), sigma=np.full(3, 2))
+    assert prior3 != bmb.Prior("Normal", mu=np.zeros(2), sigma=np.ones(2))
+    assert prior3 != prior1
+
 
 def test_family_link_unsupported():
     prior = bmb.Prior("CheeseWhiz", holes=0, taste=-10)
@@ -325,6 +321,35 @@ def test_prior_shape():
     assert parent_component.terms["q:s"].prior.args["sigma"].shape == (12,)
 
 
+def test_auto_scale_multiple_numeric_columns():
+    # Each column of a numeric term spanning multiple columns gets its own sigma
+    rng = np.random.default_rng(121195)
+    data = pd.DataFrame({"x": rng.normal(size=100), "y": rng.normal(size=100)})
+    data["b"] = (data["y"] > 0).astype(int)
+    poly = np.column_stack([data["x"], data["x"] ** 2])
+
+    model = bmb.Model("y ~ poly(x, 2, raw=True)", data)
+    sigma = model.components["mu"].terms["poly(x, 2, raw=True)"].prior.args["sigma"]
+    assert np.allclose(sigma, 2.5 * np.std(data["y"]) / np.std(poly, axis=0))
+
+    model = bmb.Model("b ~ poly(x, 2, raw=True)", data, family="bernoulli")
+    sigma = model.components["p"].terms["poly(x, 2, raw=True)"].prior.args["sigma"]
+    assert np.allclose(sigma, 1 / np.std(poly, axis=0))
+
+
+@pytest.mark.parametrize("value", [0.1, 98765.4321])
+def test_auto_scale_constant_predictor(value):
+    # A constant predictor must not result in an infinite (or huge) sigma.
+    # With large values, the computed standard deviation is tiny but not exactly zero.
+    rng = np.random.default_rng(121195)
+    data = pd.DataFrame(
+        {"y": rng.normal(size=20), "x": np.full(20, value), "g": rng.choice(["a", "b"], size=20)}
+    )
+    model = bmb.Model("y ~ 1 + (0 + x | g)", data)
+    sigma = model.components["mu"].terms["x|g"].prior.args["sigma"].args["sigma"]
+    assert np.isclose(sigma, 2.5 * np.std(data["y"]))
+
+
 def test_set_priors_but_intercept():
     rng = np.random.default_rng(121195)
     df = pd.DataFrame(
@@ -362,3 +387,10 @@ def test_custom_prior():
     model = bmb.Model("y ~ x", data, priors=priors)
     model.build()
     assert model.backend.model.free_RVs[-1].str_repr() == "x ~ Normal(0, 5)"
+
+
+def test_family_link_is_reused():
+    family1 = bmb.Family("bernoulli", bmb.Likelihood("Bernoulli", parent="p"), "logit")
+    family2 = bmb.Family("bernoulli", bmb.Likelihood("Bernoulli", parent="p"), "logit")
+    assert family1.link["p"] is family2.link["p"]
+    assert family1.link["p"].name == "logit"